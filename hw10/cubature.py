@@ -0,0 +1,261 @@
+import heapq
+import itertools
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from intN import BLOCK, CompensatedSum, f, integrate, unit_box
+
+# value：積分估計值；error：誤差估計；n_evals：被積函數的求值次數；
+# converged：誤差估計是否達到要求 (用完求值次數 / 層數上限時為 False)
+CubatureResult = namedtuple("CubatureResult", ["value", "error", "n_evals", "converged"])
+
+# Gauss-Kronrod 規則 (QUADPACK 的 qk15 與 3 點 Gauss 的 Kronrod 延伸)：
+# (Kronrod 節點 (非負半邊，由外往內), Kronrod 權重, 對應節點上的 Gauss 權重 (非 Gauss 節點為 0))
+GK_RULES = {
+    "gk15": (
+        [0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+         0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+         0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+         0.207784955007898467600689403773245, 0.0],
+        [0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+         0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+         0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+         0.204432940075298892414161999234649, 0.209482141084727828012999174891714],
+        [0.0, 0.129484966168869693270611432679082, 0.0, 0.279705391489276667901467771423780,
+         0.0, 0.381830050505118944950369775488975, 0.0, 0.417959183673469387755102040816327],
+    ),
+    "gk7": (
+        [0.960491268708020283423507092629080, 0.774596669241483377035853079956480,
+         0.434243749346802558002071502844628, 0.0],
+        [0.104656226026467265193823857192073, 0.268488089868333440728569280666710,
+         0.401397414775962222905051818618432, 0.450916538658474142345110087045571],
+        [0.0, 0.555555555555555555555555555555556, 0.0, 0.888888888888888888888888888888889],
+    ),
+}
+
+
+def _symmetric(half):
+    """非負半邊 (由外往內，最後一個為 0) -> 完整的對稱陣列"""
+    half = np.asarray(half)
+    return np.concatenate([half, half[-2::-1]])
+
+
+def gauss_kronrod(name):
+    """[-1, 1] 上的 (節點, Kronrod 權重, Gauss 權重)"""
+    x, wk, wg = GK_RULES[name]
+    x = _symmetric(x)
+    x[len(x) // 2 + 1:] *= -1
+    return x, _symmetric(wk), _symmetric(wg)
+
+
+class _TensorRule:
+    """n 維張量積 Gauss-Kronrod：單位方塊上的格點與各種權重 (攤平成一維)"""
+
+    def __init__(self, name, n):
+        x, wk, wg = gauss_kronrod(name)
+        m = len(x)
+        self.points = np.stack(np.meshgrid(*[x] * n, indexing="ij"), axis=-1).reshape(-1, n)
+        self.size = m ** n
+
+        def tensor(per_axis):
+            w = np.ones(1)
+            for axis_w in per_axis:
+                w = np.multiply.outer(w, axis_w).ravel()
+            return w
+
+        self.wk = tensor([wk] * n)
+        self.diff = self.wk - tensor([wg] * n)
+        # 第 k 軸改用 (Kronrod - Gauss) 權重：估計沿著該軸的誤差，用來決定切哪一軸
+        self.axis_diff = np.stack([
+            tensor([wk - wg if j == k else wk for j in range(n)]) for k in range(n)
+        ], axis=1)
+
+
+def _evaluate(f, X):
+    """分段呼叫向量化的 f，一次最多 BLOCK 個點"""
+    values = np.empty(len(X))
+    for start in range(0, len(X), BLOCK):
+        chunk = X[start:start + BLOCK]
+        out = np.asarray(f(chunk), dtype=float)
+        if out.shape != (len(chunk),):
+            raise ValueError(f"f 應回傳長度 {len(chunk)} 的陣列，而不是形狀 {out.shape}")
+        values[start:start + BLOCK] = out
+    return values
+
+
+def integrate_adaptive(f, rx, abs_tol=1e-8, rel_tol=0.0, rule=None, max_evals=10_000_000):
+    """
+    自適應 Gauss-Kronrod 積分：每個方塊用張量積 Kronrod 規則求值，
+    與內嵌的 Gauss 規則 (節點為 Kronrod 的子集，不需額外求值) 之差作為誤差估計。
+    誤差最大的方塊放在 heap 頂端，每一輪取出數個最差的方塊，
+    沿著「誤差估計最大的那一軸」對半切開，所有子方塊的格點合成一批呼叫 f。
+    總誤差 <= max(abs_tol, rel_tol * |積分|) 或求值次數超過 max_evals 時停止，
+    後者的 converged 為 False。
+
+    rule："gk15" (G7/K15，預設用於 3 維以下) 或 "gk7" (G3/K7，4 維以上的預設)；
+    每個方塊需要 15^n 或 7^n 個點，維度更高時請改用 integrate_sparse 或 integrate_mc。
+    """
+    n = len(rx)
+    rule = rule or ("gk15" if n <= 3 else "gk7")
+    tr = _TensorRule(rule, n)
+    per_round = max(1, min(64, BLOCK // tr.size))
+
+    def evaluate(los, his):
+        """一批方塊 -> (積分, 誤差, 切割軸)"""
+        center = (los + his) / 2
+        half = (his - los) / 2
+        X = (center[:, None, :] + half[:, None, :] * tr.points).reshape(-1, n)
+        values = _evaluate(f, X).reshape(len(los), tr.size)
+        jac = np.prod(half, axis=1)
+        return (values @ tr.wk * jac,
+                np.abs(values @ tr.diff) * jac,
+                np.argmax(np.abs(values @ tr.axis_diff), axis=1))
+
+    lo = np.array([a for a, _ in rx], dtype=float)
+    hi = np.array([b for _, b in rx], dtype=float)
+    value, err, axis = evaluate(lo[None], hi[None])
+    n_evals = tr.size
+
+    boxes = [(lo, hi, value[0], err[0], axis[0])]
+    heap = [(-err[0], 0)]
+    total, total_err = value[0], err[0]
+
+    while heap and n_evals < max_evals:
+        if total_err <= max(abs_tol, rel_tol * abs(total)):
+            break
+        picked = [heapq.heappop(heap)[1] for _ in range(min(per_round, len(heap)))]
+
+        los, his = [], []
+        for i in picked:
+            b_lo, b_hi, b_val, b_err, k = boxes[i]
+            boxes[i] = None
+            total -= b_val
+            total_err -= b_err
+            mid = (b_lo[k] + b_hi[k]) / 2
+            left_hi, right_lo = b_hi.copy(), b_lo.copy()
+            left_hi[k] = right_lo[k] = mid
+            los += [b_lo, right_lo]
+            his += [left_hi, b_hi]
+
+        los, his = np.array(los), np.array(his)
+        values, errs, axes = evaluate(los, his)
+        n_evals += len(los) * tr.size
+        for j in range(len(los)):
+            heapq.heappush(heap, (-errs[j], len(boxes)))
+            boxes.append((los[j], his[j], values[j], errs[j], axes[j]))
+        total += values.sum()
+        total_err += errs.sum()
+
+    # 累加過程中的加減會累積捨入誤差，最後重新加總
+    live = [b for b in boxes if b is not None]
+    total, total_err = math.fsum(b[2] for b in live), math.fsum(b[3] for b in live)
+    return CubatureResult(total, total_err, n_evals, total_err <= max(abs_tol, rel_tol * abs(total)))
+
+
+# ---------- Smolyak sparse grid (Clenshaw-Curtis) ----------
+def clenshaw_curtis(level):
+    """
+    第 level 層的 Clenshaw-Curtis 規則 ([-1, 1] 上的節點與權重)。
+    level 1 只有中點；level l >= 2 有 2^(l-1) + 1 個點 x_j = cos(pi j / n)，各層互相巢狀。
+    """
+    if level == 1:
+        return np.zeros(1), np.full(1, 2.0)
+    n = 2 ** (level - 1)
+    j = np.arange(n + 1)
+    theta = np.pi * j / n
+    w = np.ones(n + 1)
+    for k in range(1, n // 2 + 1):
+        b = 1.0 if 2 * k == n else 2.0
+        w -= b * np.cos(2 * k * theta) / (4 * k * k - 1)
+    w *= 2.0 / n
+    w[[0, -1]] /= 2
+    return np.cos(theta), w
+
+
+def _levels(d, total):
+    """所有 i_1 + ... + i_d = total 且 i_k >= 1 的多重索引"""
+    for cut in itertools.combinations(range(1, total), d - 1):
+        bounds = (0,) + cut + (total,)
+        yield tuple(bounds[k + 1] - bounds[k] for k in range(d))
+
+
+def sparse_grid(d, level):
+    """
+    d 維、第 level 層的 Smolyak 稀疏格點 (combination technique)，回傳 [-1, 1]^d 上的 (節點, 權重)。
+    A(q, d) = sum_{q-d+1 <= |i| <= q} (-1)^(q-|i|) C(d-1, q-|i|) (U^{i_1} x ... x U^{i_d})，q = d + level - 1。
+    各層節點巢狀，換成最細一層的整數座標後合併重複的點，每個點只會被求值一次。
+    """
+    q = d + level - 1
+    finest = 2 ** (level - 1)
+    rules = [clenshaw_curtis(l) for l in range(1, level + 1)]
+    # 第 l 層節點在最細一層中的整數位置
+    positions = [np.array([finest // 2]) if l == 1 else np.arange(2 ** (l - 1) + 1) * 2 ** (level - l)
+                 for l in range(1, level + 1)]
+
+    coords, weights = [], []
+    for total in range(max(d, q - d + 1), q + 1):
+        coeff = (-1) ** (q - total) * math.comb(d - 1, q - total)
+        for idx in _levels(d, total):
+            grids = np.meshgrid(*[positions[l - 1] for l in idx], indexing="ij")
+            coords.append(np.stack(grids, axis=-1).reshape(-1, d))
+            w = np.full(1, float(coeff))
+            for l in idx:
+                w = np.multiply.outer(w, rules[l - 1][1]).ravel()
+            weights.append(w)
+
+    coords, inverse = np.unique(np.concatenate(coords), axis=0, return_inverse=True)
+    weights = np.bincount(inverse.ravel(), weights=np.concatenate(weights))
+    nodes = rules[-1][0][coords] if level > 1 else np.zeros(coords.shape)
+    return nodes, weights
+
+
+def integrate_sparse(f, rx, level=None, abs_tol=1e-8, max_level=10):
+    """
+    Smolyak 稀疏格點積分，適合中等維度 (約 2 ~ 10 維) 的平滑函數。
+    給 level 時只算該層 (沒有誤差估計，error 為 nan、converged 為 None)；
+    否則先算第 1 層，再從第 2 層起逐層加細，相鄰兩層的結果相差 <= abs_tol 時停止
+    (誤差估計即為這個差)。到了 max_level 仍未達到 abs_tol 時 converged 為 False。
+    每一層的格點以 BLOCK 為單位分批呼叫向量化的 f，並以補償求和累加。
+    """
+    d = len(rx)
+    lo = np.array([a for a, _ in rx], dtype=float)
+    half = np.array([(b - a) / 2 for a, b in rx], dtype=float)
+    jac = float(np.prod(half))
+
+    def at_level(l):
+        nodes, weights = sparse_grid(d, l)
+        acc = CompensatedSum()
+        for start in range(0, len(nodes), BLOCK):
+            X = lo + (nodes[start:start + BLOCK] + 1) * half
+            acc.add(float(np.dot(_evaluate(f, X), weights[start:start + BLOCK])))
+        return acc.value * jac, len(nodes)
+
+    if level is not None:
+        value, n_evals = at_level(level)
+        return CubatureResult(value, float("nan"), n_evals, None)
+
+    value, n_evals = at_level(1)
+    error = float("nan")
+    for l in range(2, max_level + 1):
+        prev = value
+        value, count = at_level(l)
+        n_evals += count
+        error = abs(value - prev)
+        if error <= abs_tol:
+            break
+    return CubatureResult(value, error, n_evals, error <= abs_tol)
+
+
+# --- 測試範例 ---
+if __name__ == "__main__":
+    def peak(X):
+        return np.exp(-np.sum((X - 0.3) ** 2, axis=1) * 25)
+
+    exact = (math.sqrt(math.pi) / 10 * (math.erf(3.5) + math.erf(1.5))) ** 3
+    print("exact     ", exact)
+    print("grid      ", integrate(peak, unit_box(3), step=0.02, rule="midpoint"), 50 ** 3, "evals")
+    print("adaptive  ", integrate_adaptive(peak, unit_box(3)))
+    print("sparse    ", integrate_sparse(peak, unit_box(3)))
+    print("x^2 sum 6D", integrate_sparse(f, unit_box(6)), "exact", 2.0)
@@ -1,28 +1,242 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
-step = 0.1
+from qmc import Halton, Sobol
+
+STEP = 0.1
+
+# 每次呼叫被積函數的點數 (block, n) 上限
+BLOCK = 65536
+
+# Monte Carlo：每次呼叫被積函數的樣本數、每一輪每個樣本流處理幾批、QMC 的獨立隨機化次數
+MC_BATCH = 8192
+MC_ROUND_BATCHES = 4
+MC_REPLICATES = 16
+
+# value：積分估計值；stderr：標準誤；n_samples：實際使用的樣本數
+MCResult = namedtuple("MCResult", ["value", "stderr", "n_samples"])
+
+RULES = ("left", "midpoint", "trapezoid", "simpson")
 
-def range(n):
+
+def unit_box(n):
+    """n 維的單位立方體 [0, 1]^n"""
     return [(0, 1)] * n
 
-def integrate(f, rx):
-    n = len(rx)
 
-    def recursive_integrate(f, dim, vars):
-        if len(dim) > 0:
-            (a, b) = dim[0] #[0,1]
-            
-            total = 0.0
-            for x in np.arange(a, b, step):
-                total += recursive_integrate(f, dim[1:], vars + [x])
-            return total
+def axis_rule(a, b, step, rule):
+    """
+    單一軸上的積分點與權重 (nodes, weights)。
+    left 與原本的寫法相同：np.arange(a, b, step)，每點權重 step；
+    其他規則把 [a, b] 均分成 ceil((b - a) / step) 段 (Simpson 取偶數段)。
+    """
+    if rule == "left":
+        nodes = np.arange(a, b, step)
+        return nodes, np.full(len(nodes), float(step))
+
+    n = max(1, int(np.ceil((b - a) / step - 1e-9)))
+    if rule == "midpoint":
+        h = (b - a) / n
+        return a + (np.arange(n) + 0.5) * h, np.full(n, h)
+    if rule == "trapezoid":
+        h = (b - a) / n
+        w = np.full(n + 1, h)
+        w[[0, -1]] = h / 2
+        return np.linspace(a, b, n + 1), w
+    if rule == "simpson":
+        n += n % 2
+        h = (b - a) / n
+        w = np.full(n + 1, 2 * h / 3)
+        w[1::2] = 4 * h / 3
+        w[[0, -1]] = h / 3
+        return np.linspace(a, b, n + 1), w
+    raise ValueError(f"未知的積分規則: {rule}")
+
+
+class CompensatedSum:
+    """Neumaier 補償求和：累加大量區塊的部分和時不會讓捨入誤差隨區塊數成長"""
+
+    def __init__(self):
+        self.total = 0.0
+        self.comp = 0.0
+
+    def add(self, x):
+        t = self.total + x
+        if abs(self.total) >= abs(x):
+            self.comp += (self.total - t) + x
         else:
-            # 所有變數都有值 → 計算函數值
-            return f(*vars) * (step ** n)
+            self.comp += (x - t) + self.total
+        self.total = t
+
+    @property
+    def value(self):
+        return self.total + self.comp
+
+
+def integrate(f, rx, step=STEP, rule="left", block=BLOCK):
+    """
+    在 rx = [(a1, b1), (a2, b2), ...] 的方塊上對 f 做張量格點積分。
+
+    f 必須是向量化的：f(X) 的 X 形狀為 (點數, n)，回傳長度為點數的陣列。
+    格點不會一次全部建出來：依序取第 start ~ start + block 個格點，
+    以 np.unravel_index 換成各軸的索引，一次呼叫 f 算完整個區塊。
+    rule 可以是單一規則或每一軸各自的規則 (left / midpoint / trapezoid / simpson)；
+    區塊內以 NumPy 的 pairwise 求和，區塊之間以 Neumaier 補償求和累加。
+    """
+    n = len(rx)
+    rules = [rule] * n if isinstance(rule, str) else list(rule)
+    if len(rules) != n:
+        raise ValueError("rule 的個數必須與維度相同")
+
+    axes = [axis_rule(a, b, step, r) for (a, b), r in zip(rx, rules)]
+    shape = tuple(len(nodes) for nodes, _ in axes)
+    total_points = int(np.prod(shape, dtype=np.int64))
+
+    acc = CompensatedSum()
+    X = np.empty((min(block, total_points), n))
+    for start in range(0, total_points, block):
+        stop = min(start + block, total_points)
+        idx = np.unravel_index(np.arange(start, stop), shape)
+
+        x = X[:stop - start]
+        w = np.ones(stop - start)
+        for k, (nodes, weights) in enumerate(axes):
+            np.take(nodes, idx[k], out=x[:, k])
+            w *= weights[idx[k]]
+
+        values = np.asarray(f(x), dtype=float)
+        if values.shape != (stop - start,):
+            raise ValueError(f"f 應回傳長度 {stop - start} 的陣列，而不是形狀 {values.shape}")
+        acc.add(float(np.dot(values, w)))
+    return acc.value
+
+
+# ---------- Monte Carlo / quasi-Monte Carlo ----------
+def merge_stats(a, b):
+    """合併兩組 (個數, 平均, 離均差平方和) (Chan et al. 的平行變異數公式)"""
+    na, mean_a, m2_a = a
+    nb, mean_b, m2_b = b
+    n = na + nb
+    if n == 0:
+        return a
+    delta = mean_b - mean_a
+    return n, mean_a + delta * nb / n, m2_a + m2_b + delta * delta * na * nb / n
+
+
+_generators = {}
+
+
+def _generator(method, dims, seed):
+    """同一個 process 內重複使用已建好的 QMC 序列 (建構 scramble 需要一點時間)"""
+    key = (method, dims, seed.entropy, seed.spawn_key)
+    gen = _generators.get(key)
+    if gen is None:
+        if len(_generators) >= 64:
+            _generators.clear()
+        gen = (Sobol if method == "sobol" else Halton)(dims, seed)
+        _generators[key] = gen
+    return gen
+
+
+def _mc_task(task):
+    """
+    一個樣本流的一段：第 start ~ start + count - 1 個樣本，分批呼叫 f，
+    只保留 (個數, 平均, 離均差平方和)，記憶體與樣本數無關。
+    (process pool 的工作單元，需為模組層級函式才能 pickle)
+    """
+    f, lo, width, method, seed, start, count, batch = task
+    dims = len(lo)
+    if method == "mc":
+        rng = np.random.default_rng(seed)
+    else:
+        gen = _generator(method, dims, seed)
+
+    stats = (0, 0.0, 0.0)
+    for s in range(start, start + count, batch):
+        n = min(batch, start + count - s)
+        x = rng.random((n, dims)) if method == "mc" else gen.points(s, n)
+        x *= width
+        x += lo
+        values = np.asarray(f(x), dtype=float)
+        if values.shape != (n,):
+            raise ValueError(f"f 應回傳長度 {n} 的陣列，而不是形狀 {values.shape}")
+        mean = values.mean()
+        stats = merge_stats(stats, (n, mean, float(np.sum((values - mean) ** 2))))
+    return stats
+
+
+def integrate_mc(f, rx, n_samples=2**20, method="sobol", target_se=None,
+                 batch=MC_BATCH, replicates=MC_REPLICATES, workers=None, seed=None):
+    """
+    以 Monte Carlo (method="mc") 或 scrambled Sobol / Halton quasi-Monte Carlo
+    ("sobol" / "halton") 在 rx 的方塊上積分，回傳 MCResult(value, stderr, n_samples)。
+
+    f 與 integrate 相同為向量化函式 (X 形狀為 (batch, n))；workers > 1 時 f 必須能被 pickle
+    (模組層級函式)。workers=1 時不建立 process pool，直接在目前的 process 執行。
+
+    - mc：每一輪派出 workers 個由 SeedSequence 派生的獨立樣本流，
+      以 Chan 公式合併平均與變異數，標準誤為 sqrt(var / n)
+    - sobol / halton：同一個點集做 replicates 次獨立的隨機 scramble，
+      每次 scramble 各自累積平均，標準誤由這些平均之間的差異估計
+      (QMC 點彼此不獨立，不能直接用單一序列的樣本變異數)
+    每一輪結束後若標準誤已小於 target_se 就提早停止；最多使用約 n_samples 個樣本。
+    """
+    if method not in ("mc", "sobol", "halton"):
+        raise ValueError(f"未知的取樣方法: {method}")
+    lo = np.array([a for a, _ in rx], dtype=float)
+    width = np.array([b - a for a, b in rx], dtype=float)
+    volume = float(np.prod(width))
+    workers = workers or os.cpu_count() or 1
+
+    root = np.random.SeedSequence(seed)
+    streams = workers if method == "mc" else replicates
+    seeds = None if method == "mc" else root.spawn(streams)
+    per_stream = -(-n_samples // streams)
+    chunk = batch * MC_ROUND_BATCHES
+
+    stats = [(0, 0.0, 0.0)] * streams
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        done = 0
+        while done < per_stream:
+            count = min(chunk, per_stream - done)
+            if method == "mc":
+                tasks = [(f, lo, width, method, s, 0, count, batch) for s in root.spawn(streams)]
+            else:
+                tasks = [(f, lo, width, method, s, done, count, batch) for s in seeds]
+            outcomes = pool.map(_mc_task, tasks) if pool else map(_mc_task, tasks)
+            stats = [merge_stats(a, b) for a, b in zip(stats, outcomes)]
+            done += count
+
+            value, stderr = _mc_estimate(stats, method)
+            if target_se is not None and volume * stderr <= target_se:
+                break
+    finally:
+        if pool:
+            pool.shutdown()
+
+    return MCResult(volume * value, volume * stderr, sum(n for n, _, _ in stats))
+
+
+def _mc_estimate(stats, method):
+    """由各樣本流的統計量算出 (平均, 標準誤)"""
+    if method == "mc":
+        n, mean, m2 = stats[0]
+        for s in stats[1:]:
+            n, mean, m2 = merge_stats((n, mean, m2), s)
+        return float(mean), float(np.sqrt(m2 / (n - 1) / n)) if n > 1 else float("inf")
+
+    means = np.array([mean for _, mean, _ in stats])
+    return float(means.mean()), float(means.std(ddof=1) / np.sqrt(len(means)))
+
 
-    return recursive_integrate(f, rx, [])
+def f(X):
+    return np.sum(X ** 2, axis=1)
 
-def f(*args):
-    return sum(x**2 for x in args)
 
-print(integrate(f, range(4)))  
+if __name__ == "__main__":
+    print(integrate(f, unit_box(4)))
+    print(integrate_mc(f, unit_box(20), method="sobol", workers=1, seed=0))
@@ -0,0 +1,163 @@
+import numpy as np
+
+# Sobol 點以 32 bit 整數表示，最多 2^32 個點
+SOBOL_BITS = 32
+
+
+# ---------- GF(2) 多項式 (以 int 的 bit 表示係數) ----------
+def _polymulmod(a, b, mod, deg):
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        b >>= 1
+        a <<= 1
+        if a >> deg & 1:
+            a ^= mod
+    return result
+
+
+def _polypowmod(base, e, mod, deg):
+    result = 1
+    while e:
+        if e & 1:
+            result = _polymulmod(result, base, mod, deg)
+        base = _polymulmod(base, base, mod, deg)
+        e >>= 1
+    return result
+
+
+def _prime_factors(n):
+    factors, p = [], 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def _is_primitive(poly, deg):
+    """x 在 GF(2)[x] / poly 中的階數恰為 2^deg - 1 時，poly 為本原多項式"""
+    order = (1 << deg) - 1
+    if _polypowmod(2, order, poly, deg) != 1:
+        return False
+    return all(_polypowmod(2, order // q, poly, deg) != 1 for q in _prime_factors(order))
+
+
+def primitive_polynomials(count):
+    """依次數由小到大列出前 count 個本原多項式 [(次數, 多項式), ...]"""
+    found = []
+    deg = 1
+    while len(found) < count:
+        # 最高次項與常數項一定是 1
+        for poly in range((1 << deg) | 1, 1 << (deg + 1), 2):
+            if _is_primitive(poly, deg):
+                found.append((deg, poly))
+                if len(found) == count:
+                    break
+        deg += 1
+    return found
+
+
+def sobol_directions(dims):
+    """
+    (dims, SOBOL_BITS) 的 Sobol 方向數 V[d, j] (第 j 個 bit 對應的 32 bit 整數)。
+
+    第 0 維為 van der Corput 序列；其餘各維依序使用一個本原多項式，
+    初始值 m_1..m_s 取小於 2^k 的奇數 (以固定種子產生，結果可重現)，
+    之後依 Sobol 遞迴式 m_k = 2 a_1 m_{k-1} ^ ... ^ 2^s m_{k-s} ^ m_{k-s} 展開。
+    """
+    V = np.zeros((dims, SOBOL_BITS), dtype=np.uint64)
+    V[0] = [1 << (SOBOL_BITS - 1 - j) for j in range(SOBOL_BITS)]
+
+    rng = np.random.default_rng(0)
+    for d, (s, poly) in enumerate(primitive_polynomials(dims - 1), start=1):
+        m = [int(rng.integers(0, 1 << (k - 1))) * 2 + 1 for k in range(1, s + 1)]
+        for k in range(s, SOBOL_BITS):
+            new = m[k - s] ^ (m[k - s] << s)
+            for i in range(1, s):
+                if poly >> (s - i) & 1:
+                    new ^= m[k - i] << i
+            m.append(new)
+        V[d] = [m[j] << (SOBOL_BITS - 1 - j) for j in range(SOBOL_BITS)]
+    return V
+
+
+class Sobol:
+    """
+    Scrambled Sobol 序列：方向數先做隨機 linear matrix scramble (下三角 GF(2) 矩陣)，
+    再對每一維 XOR 一個隨機的 digital shift，仍保持 (t, m, s)-net 的結構。
+    points(start, count) 可以直接取任意一段，不需要依序產生，方便分給多個 process。
+    """
+
+    def __init__(self, dims, seed=None):
+        rng = np.random.default_rng(seed)
+        self.dims = dims
+        V = sobol_directions(dims)
+
+        # 把方向數拆成 bits (由最高位起算)，乘上隨機下三角矩陣 (mod 2) 後再組回整數
+        shifts = np.arange(SOBOL_BITS - 1, -1, -1, dtype=np.uint64)
+        bits = ((V[:, :, None] >> shifts) & 1).astype(np.int64)          # (dims, j, digit)
+        L = np.tril(rng.integers(0, 2, (dims, SOBOL_BITS, SOBOL_BITS)), -1)
+        L[:, np.arange(SOBOL_BITS), np.arange(SOBOL_BITS)] = 1
+        scrambled = np.einsum("djk,dik->dji", bits, L) & 1
+        self.V = (scrambled.astype(np.uint64) << shifts).sum(axis=2).astype(np.uint32)
+        self.shift = rng.integers(0, 1 << SOBOL_BITS, dims, dtype=np.uint64).astype(np.uint32)
+
+    def points(self, start, count):
+        """第 start ~ start + count - 1 個點，形狀 (count, dims)，值在 [0, 1)"""
+        idx = np.arange(start, start + count, dtype=np.uint64)
+        X = np.broadcast_to(self.shift, (count, self.dims)).copy()
+        j = 0
+        while j < SOBOL_BITS and (idx >> np.uint64(j)).any():
+            on = ((idx >> np.uint64(j)) & np.uint64(1)).astype(bool)
+            X[on] ^= self.V[:, j]
+            j += 1
+        # 取最細格子的中心，避免 32 bit 截斷造成往 0 偏的系統誤差 (也不會出現 0)
+        return (X + 0.5) * 2.0 ** -SOBOL_BITS
+
+
+def first_primes(n):
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+class Halton:
+    """
+    Scrambled Halton 序列：第 d 維以第 d 個質數 b 為底做 radical inverse，
+    每個位數位置各用一組隨機的數字排列 (Owen 式 digit scrambling)，
+    打散高維度時相鄰質數底之間的相關性。
+    """
+
+    def __init__(self, dims, seed=None):
+        rng = np.random.default_rng(seed)
+        self.dims = dims
+        self.bases = first_primes(dims)
+        # 每一維取足夠的位數，使最後一位小於 2^-32
+        self.perms = [
+            np.array([rng.permutation(b) for _ in range(int(np.ceil(32 / np.log2(b))))])
+            for b in self.bases
+        ]
+
+    def points(self, start, count):
+        idx = np.arange(start, start + count, dtype=np.int64)
+        X = np.zeros((count, self.dims))
+        for d, (b, perms) in enumerate(zip(self.bases, self.perms)):
+            rest = idx.copy()
+            scale = 1.0 / b
+            col = X[:, d]
+            for perm in perms:
+                rest, digit = np.divmod(rest, b)
+                col += perm[digit] * scale
+                scale /= b
+            col += 0.5 * b * scale  # 同 Sobol，取最後一位格子的中心
+        return X
@@ -1,21 +1,21 @@
 import math
 import random
+
+from regression import Dataset
+
+
 def calculate_loss(w, b, x_data, y_data):
     """
     計算均方誤差 (MSE)
     Loss = (1/n) * Σ(y_true - y_pred)^2
     """
-    total_error = 0
-    n = len(x_data)
-    
-    for x, y in zip(x_data, y_data):
-        prediction = w * x + b
-        total_error += (y - prediction) ** 2
+    return Dataset(x_data, y_data).loss(w, b)
         
 def simulated_annealing(x_data, y_data, iterations=1000):
     w = random.uniform(-10, 10)
     b = random.uniform(-10, 10)
-    current_loss = calculate_loss(w, b, x_data, y_data)
+    data = Dataset(x_data, y_data)
+    current_loss = data.loss(w, b)
     
     temperature = 1000
     cooling_rate = 0.95  # 降溫係數
@@ -24,7 +24,7 @@ def simulated_annealing(x_data, y_data, iterations=1000):
         # 隨機選一個鄰居
         next_w = w + random.uniform(-0.5, 0.5)
         next_b = b + random.uniform(-0.5, 0.5)
-        next_loss = calculate_loss(next_w, next_b, x_data, y_data)
+        next_loss = data.loss(next_w, next_b)
         
         delta_E = next_loss - current_loss
         
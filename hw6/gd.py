@@ -4,6 +4,97 @@ from numpy.linalg import norm
 
 np.set_printoptions(precision=4)
 
+GRAD_METHODS = ("forward", "central", "complex")
+
+# 各方法預設的差分步長 (complex step 沒有相減抵銷的問題，可以取極小的 h)
+DEFAULT_STEPS = {"forward": 0.01, "central": 0.01, "complex": 1e-20}
+
+
+class Gradient:
+    """
+    有限差分梯度引擎：一次建出所有擾動點，盡量只呼叫 f 一次。
+
+    擾動點以「行」排成 (d, m) 的矩陣 P，第 j 行是第 j 個點，
+    所以 f 內的 x, y = p 或 p[0]、p[1] 會直接取到長度 m 的向量，
+    寫成 f(P) 回傳長度 m 的陣列即為向量化的 f。
+    - forward：[p, p + h e_1, ..., p + h e_d]，共 d + 1 點
+    - central：[p, p ± h e_k]，共 2d + 1 點 (第一點只用來取 f(p))
+    - complex：[p, p + ih e_k]，f 必須能處理複數；Im f / h 沒有相減誤差
+    第一次呼叫時檢查 f 是否能向量化 (每一點的結果都必須與單點呼叫一致)，
+    不能的話 (例如用了 sum(p) 或 math 函式) 就退回逐點呼叫。
+    """
+
+    def __init__(self, f, step=None, method="forward", vectorized=None):
+        if method not in GRAD_METHODS:
+            raise ValueError(f"未知的梯度方法: {method}")
+        self.f = f
+        self.method = method
+        self.step = DEFAULT_STEPS[method] if step is None else step
+        self.vectorized = vectorized
+
+    def points(self, p, with_base=True):
+        """擾動點矩陣 P (d, m)"""
+        d = len(p)
+        h = self.step
+        dtype = complex if self.method == "complex" else float
+        offsets = np.eye(d) * (1j * h if self.method == "complex" else h)
+        if self.method == "central":
+            offsets = np.concatenate([offsets, -offsets], axis=1)
+        base = np.asarray(p, dtype=dtype)[:, None]
+        P = base + offsets
+        return np.concatenate([base, P], axis=1) if with_base else P
+
+    def _evaluate(self, P):
+        m = P.shape[1]
+        if self.vectorized is None:
+            self.vectorized, values = self._probe(P)
+            return values
+        if self.vectorized:
+            return np.asarray(self.f(P)).reshape(m)
+        return self._pointwise(P)
+
+    def _pointwise(self, P):
+        return np.array([self.f(P[:, j].copy()) for j in range(P.shape[1])])
+
+    def _probe(self, P):
+        """
+        第一次呼叫：f(P) 必須與「每一行」的單點呼叫結果都一致才視為向量化
+        (只比對未擾動的第一行，會把 np.min(p) 這類對整個矩陣做化約的 f 誤判為向量化)。
+        回傳 (是否向量化, 這一批的函數值)；不一致時直接沿用逐點呼叫的結果。
+        """
+        expected = self._pointwise(P)
+        try:
+            values = np.asarray(self.f(P.copy()))
+        except Exception:
+            return False, expected
+        if values.shape != expected.shape or not np.allclose(values, expected, rtol=1e-12, atol=0):
+            return False, expected
+        return True, values
+
+    def __call__(self, p, fp=None):
+        """(f(p), 梯度)；已知 f(p) 時可傳入 fp，forward 便少算一點"""
+        h = self.step
+        with_base = fp is None or self.method != "forward"
+        values = self._evaluate(self.points(p, with_base))
+        if with_base:
+            base, values = values[0], values[1:]
+            fp = float(np.real(base)) if fp is None else fp
+
+        if self.method == "forward":
+            gp = (np.real(values) - fp) / h
+        elif self.method == "central":
+            d = len(p)
+            gp = (values[:d] - values[d:]) / (2 * h)
+        else:
+            gp = np.imag(values) / h
+        return fp, np.asarray(gp, dtype=float)
+
+
+def value_and_grad(f, p, step=None, method="forward"):
+    """函數 f 在點 p 上的值與梯度 (f(p), grad)"""
+    return Gradient(f, step, method)(p)
+
+
 # 函數 f 對變數 k 的偏微分: df / dk
 def df(f, p, k, step=0.01):
     p1 = p.copy()
@@ -11,26 +102,22 @@ def df(f, p, k, step=0.01):
     return (f(p1) - f(p)) / step
 
 # 函數 f 在點 p 上的梯度
-def grad(f, p, step=0.01):
-    gp = p.copy()
-    for k in range(len(p)):
-        gp[k] = df(f, p, k, step)
-    return gp
+def grad(f, p, step=0.01, method="forward"):
+    return value_and_grad(f, p, step, method)[1]
 
 # 使用梯度下降法尋找函數最低點
-def gradientDescendent(f, p0, step=0.01, max_loops=100000, dump_period=1000):
-    p = p0.copy()
-    fp0 = f(p)
+def gradientDescendent(f, p0, step=0.01, max_loops=100000, dump_period=1000,
+                       method="forward", grad_step=None):
+    p = np.array(p0, dtype=float)
+    gradient = Gradient(f, grad_step, method) # 同一個 f 只偵測一次能否向量化
     for i in range(max_loops):
-        fp = f(p)
-        gp = grad(f, p) # 計算梯度 gp
+        fp, gp = gradient(p) # f(p) 與梯度 gp 在同一次呼叫中算出
         glen = norm(gp) # norm = 梯度的長度 (步伐大小)
-        if i%dump_period == 0: 
+        if i%dump_period == 0:
             print('{:05d}:f(p)={:.3f} p={:s} gp={:s} glen={:.5f}'.format(i, fp, str(p), str(gp), glen))
-        if glen < 0.00001: # or fp0 < fp:  # 如果步伐已經很小了，或者 f(p) 變大了，那麼就停止吧！
+        if glen < 0.00001: # 如果步伐已經很小了，那麼就停止吧！
             break
         gstep = np.multiply(gp, -1*step) # gstep = 逆梯度方向的一小步
         p +=  gstep # 向 gstep 方向走一小步
-        fp0 = fp
     print('{:05d}:f(p)={:.3f} p={:s} gp={:s} glen={:.5f}'.format(i, fp, str(p), str(gp), glen))
-    return p # 傳回最低點！
\ No newline at end of file
+    return p # 傳回最低點！
@@ -1,18 +1,11 @@
+from regression import Dataset, fit_gradient_descent
+
+
 def gradient_descent(x_data, y_data, iterations=1000, lr=0.001):
-    w = 0
-    b = 0
-    n = len(x_data)
-    
-    for _ in range(iterations):
-        # 計算預測值
-        y_pred = [w * x + b for x in x_data]
-        
-        # 計算梯度 (這裡省略了係數 2，常被併入 learning rate)
-        w_grad = sum((y_p - y) * x for y_p, y, x in zip(y_pred, y_data, x_data)) * (2/n)
-        b_grad = sum((y_p - y) for y_p, y in zip(y_pred, y_data)) * (2/n)
-        
-        # 貪婪更新：往梯度反方向走
-        w = w - lr * w_grad
-        b = b - lr * b_grad
-        
-    return w, b
\ No newline at end of file
+    """
+    全批次梯度下降擬合 y = w * x + b，回傳 (w, b)。
+    每一步的梯度 (2/n) Σ(y_p - y) * x、(2/n) Σ(y_p - y) 由 regression.Dataset 的統計量直接算出，
+    不再逐點建立 y_pred；x_data / y_data 可以是 list、NumPy 陣列或 np.memmap。
+    """
+    # 貪婪更新：往梯度反方向走
+    return fit_gradient_descent(Dataset(x_data, y_data), iterations, lr)
@@ -1,21 +1,21 @@
 import random
+
+from regression import Dataset
+
+
 def calculate_loss(w, b, x_data, y_data):
     """
     計算均方誤差 (MSE)
     Loss = (1/n) * Σ(y_true - y_pred)^2
     """
-    total_error = 0
-    n = len(x_data)
-    
-    for x, y in zip(x_data, y_data):
-        prediction = w * x + b
-        total_error += (y - prediction) ** 2
+    return Dataset(x_data, y_data).loss(w, b)
         
 def hill_climbing(x_data, y_data, iterations=1000):
     # 1. 隨機初始化
     w = random.uniform(-10, 10)
     b = random.uniform(-10, 10)
-    current_loss = calculate_loss(w, b, x_data, y_data)
+    data = Dataset(x_data, y_data)
+    current_loss = data.loss(w, b)
     step_size = 0.01
 
     for _ in range(iterations):
@@ -30,7 +30,7 @@ def hill_climbing(x_data, y_data, iterations=1000):
 
         # 3. 找最好的鄰居
         for (nw, nb) in candidates:
-            loss = calculate_loss(nw, nb, x_data, y_data)
+            loss = data.loss(nw, nb)
             if loss < best_neighbor_loss:
                 best_neighbor_loss = loss
                 best_neighbor = (nw, nb)
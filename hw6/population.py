@@ -0,0 +1,140 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from regression import Dataset, quadratic_loss
+
+# params：最佳參數向量；loss：對應的 loss；trace：每一輪結束時整個族群的最佳 loss
+SearchResult = namedtuple("SearchResult", ["params", "loss", "trace"])
+
+# 初始點在 [-INIT_RANGE, INIT_RANGE] 內均勻取樣 (與原本的 random.uniform(-10, 10) 相同)
+INIT_RANGE = 10.0
+
+
+def _initial(rng, population, dims, init):
+    if init is None:
+        return rng.uniform(-INIT_RANGE, INIT_RANGE, (population, dims))
+    return np.array(np.broadcast_to(init, (population, dims)), dtype=float)
+
+
+def _evaluate(loss, X):
+    values = np.asarray(loss(X), dtype=float)
+    if values.shape != (len(X),):
+        raise ValueError(f"loss 應回傳長度 {len(X)} 的陣列，而不是形狀 {values.shape}")
+    return values
+
+
+def population_hill_climbing(loss, dims, iterations=1000, population=64, step_size=0.5,
+                             min_step=1e-6, init=None, rng=None):
+    """
+    族群爬山法：population 個起點同時爬山。
+    loss 為向量化的目標函數：輸入 (點數, dims) 的參數矩陣，回傳長度為點數的陣列。
+
+    每一輪每個點都嘗試沿各軸 ± step 的 2 * dims 個鄰居 (dims = 2 時就是原本的上下左右)，
+    所有點的鄰居合成一個矩陣，只呼叫一次 loss。
+    有更好的鄰居就移過去；沒有時把該點的步伐減半，所有步伐都小於 min_step 就停止。
+    """
+    rng = np.random.default_rng(rng)
+    X = _initial(rng, population, dims, init)
+    L = _evaluate(loss, X)
+    step = np.full(population, float(step_size))
+    moves = np.concatenate([np.eye(dims), -np.eye(dims)])            # (2 * dims, dims)
+    trace = []
+
+    for _ in range(iterations):
+        active = step >= min_step
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        candidates = X[idx, None, :] + step[idx, None, None] * moves      # (k, 2 * dims, dims)
+        values = _evaluate(loss, candidates.reshape(-1, dims)).reshape(len(idx), len(moves))
+
+        best = values.argmin(axis=1)
+        best_loss = values[np.arange(len(idx)), best]
+        better = best_loss < L[idx]
+        moved = idx[better]
+        X[moved] = candidates[better, best[better]]
+        L[moved] = best_loss[better]
+        step[idx[~better]] /= 2
+        trace.append(L.min())
+
+    i = L.argmin()
+    return SearchResult(X[i].copy(), float(L[i]), np.array(trace))
+
+
+def population_annealing(loss, dims, iterations=1000, population=64, temperature=1000.0,
+                         cooling_rate=0.95, step_size=0.5, init=None, rng=None):
+    """
+    族群模擬退火：population 條獨立的退火鏈一起前進，每一輪每條鏈提出一個隨機鄰居
+    (各分量在 ±step_size 內均勻擾動)，整個族群只呼叫一次 loss，
+    再以 Metropolis 準則 (向量化) 決定接受與否。溫度與降溫方式和原本的 simulated_annealing 相同。
+    回傳過程中看過的最佳點。
+    """
+    rng = np.random.default_rng(rng)
+    X = _initial(rng, population, dims, init)
+    L = _evaluate(loss, X)
+    best_X, best_L = X.copy(), L.copy()
+    trace = np.empty(iterations)
+
+    for it in range(iterations):
+        proposal = X + rng.uniform(-step_size, step_size, X.shape)
+        proposal_loss = _evaluate(loss, proposal)
+        delta = proposal_loss - L
+        # 更好一定接受；更差則以 exp(-ΔE / T) 的機率接受 (先截成非負以免 exp 溢位)
+        accept = rng.random(population) < np.exp(-np.maximum(delta, 0) / temperature)
+        X[accept] = proposal[accept]
+        L[accept] = proposal_loss[accept]
+
+        improved = L < best_L
+        best_X[improved] = X[improved]
+        best_L[improved] = L[improved]
+        trace[it] = best_L.min()
+        temperature *= cooling_rate
+
+    i = best_L.argmin()
+    return SearchResult(best_X[i].copy(), float(best_L[i]), trace)
+
+
+SEARCHES = {"hill": population_hill_climbing, "annealing": population_annealing}
+
+
+def _chain_task(task):
+    """一次重新開始 (一條鏈)；process pool 的工作單元，需為模組層級函式才能 pickle"""
+    method, loss, dims, seed, options = task
+    return SEARCHES[method](loss, dims, rng=np.random.default_rng(seed), **options)
+
+
+def multi_restart(objective, dims=None, method="annealing", restarts=8, workers=None,
+                  seed=None, **options):
+    """
+    從 restarts 個獨立的隨機起點各跑一次族群搜尋 (method = "hill" / "annealing")，
+    回傳 (最佳的 SearchResult, 每條鏈的 SearchResult 串列)。
+
+    objective 可以是 regression.Dataset (參數為 (w_1, ..., w_d, b)，維度自動決定)，
+    或任意向量化的 loss 函式 (此時需給 dims；workers > 1 時必須能被 pickle)。
+    Dataset 會先算好統計量，只把統計量傳給其他 process，不會複製資料。
+    各鏈的亂數種子由 SeedSequence(seed) 派生，結果與 workers 數無關、可重現；
+    鏈之間互不相依，速度大致隨核心數線性成長。workers=1 時直接在目前的 process 執行。
+    """
+    if method not in SEARCHES:
+        raise ValueError(f"未知的搜尋方法: {method}")
+    if isinstance(objective, Dataset):
+        dims = objective.d + 1
+        loss = partial(quadratic_loss, objective.moments())
+    elif dims is None:
+        raise ValueError("使用自訂的 loss 時必須指定 dims")
+    else:
+        loss = objective
+    workers = workers or os.cpu_count() or 1
+
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+    tasks = [(method, loss, dims, s, options) for s in seeds]
+    if workers == 1:
+        results = [_chain_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, restarts)) as pool:
+            results = list(pool.map(_chain_task, tasks))
+    return min(results, key=lambda r: r.loss), results
@@ -0,0 +1,179 @@
+import numpy as np
+
+# 每次處理的資料點數 (memmap 時也只會讀進這麼多)
+CHUNK = 1 << 20
+
+
+class Dataset:
+    """
+    線性迴歸 y ≈ x·w + b 的資料集。x 為 (n,) 或 (n, d)，y 為 (n,)。
+
+    資料存成連續的 float64 陣列；也可以直接傳入 np.memmap (或用 Dataset.load 開啟 .npy)，
+    所有運算都以 CHUNK 個點為單位分段處理，不會整份讀進記憶體。
+
+    MSE 是參數的二次函數，只需要平均值與 (共) 變異數：
+        MSE(w, b) = wᵀ Cxx w - 2 wᵀ cxy + vyy + c²，c = w·mx + b - my
+    這些統計量在第一次用到時以一次分段掃描算好 (各段以 Chan 公式合併，數值穩定)，
+    之後 loss / gradient 都是 O(d²)，與資料筆數無關。
+    """
+
+    def __init__(self, x, y, chunk=CHUNK):
+        self.x = self._column(x)
+        self.y = y if isinstance(y, np.memmap) else np.ascontiguousarray(y, dtype=np.float64)
+        if self.x.ndim == 1:
+            self.x = self.x[:, None]
+        if len(self.x) != len(self.y):
+            raise ValueError("x 與 y 的筆數不同")
+        self.n, self.d = self.x.shape
+        self.chunk = chunk
+        self._moments = None
+
+    @staticmethod
+    def _column(a):
+        return a if isinstance(a, np.memmap) else np.ascontiguousarray(a, dtype=np.float64)
+
+    @classmethod
+    def load(cls, x_path, y_path, chunk=CHUNK):
+        """以 memmap 開啟 np.save 存下的 x / y (.npy)"""
+        return cls(np.load(x_path, mmap_mode="r"), np.load(y_path, mmap_mode="r"), chunk)
+
+    def save(self, x_path, y_path):
+        np.save(x_path, self.x if self.d > 1 else self.x[:, 0])
+        np.save(y_path, self.y)
+
+    def chunks(self, start=0, stop=None):
+        """依序取出 (x, y) 的片段，memmap 的片段在這裡才轉成 float64"""
+        stop = self.n if stop is None else stop
+        for s in range(start, stop, self.chunk):
+            e = min(s + self.chunk, stop)
+            yield np.asarray(self.x[s:e], dtype=np.float64), np.asarray(self.y[s:e], dtype=np.float64)
+
+    # ---------- 統計量 ----------
+    def moments(self):
+        """(mx, my, Cxx, cxy, vyy)：平均值與母體 (共) 變異數，只計算一次"""
+        if self._moments is None:
+            n = 0
+            mx, my = np.zeros(self.d), 0.0
+            sxx, sxy, syy = np.zeros((self.d, self.d)), np.zeros(self.d), 0.0
+            for xc, yc in self.chunks():
+                m = len(yc)
+                cx, cy = xc.mean(axis=0), yc.mean()
+                dx, dy = xc - cx, yc - cy
+                # Chan 的平行合併公式：兩段各自的離均差乘積和 + 平均值差造成的修正
+                total = n + m
+                delta_x, delta_y = cx - mx, cy - my
+                k = n * m / total
+                sxx += dx.T @ dx + np.outer(delta_x, delta_x) * k
+                sxy += dx.T @ dy + delta_x * delta_y * k
+                syy += dy @ dy + delta_y * delta_y * k
+                mx += delta_x * m / total
+                my += delta_y * m / total
+                n = total
+            if n == 0:
+                raise ValueError("資料集是空的")
+            self._moments = (mx, my, sxx / n, sxy / n, syy / n)
+        return self._moments
+
+    def _params(self, w, b):
+        # 純量 w (例如預設的 0.0) 代表所有特徵的權重都相同
+        w = np.asarray(w, dtype=np.float64)
+        return np.broadcast_to(w, (self.d,)).copy() if w.ndim == 0 else w.reshape(self.d), float(b)
+
+    def _unparam(self, grad_w):
+        return float(grad_w[0]) if self.d == 1 else grad_w
+
+    def loss(self, w, b):
+        """均方誤差 MSE = (1/n) Σ(y - (x·w + b))²"""
+        w, b = self._params(w, b)
+        mx, my, cxx, cxy, vyy = self.moments()
+        c = w @ mx + b - my
+        return float(w @ cxx @ w - 2 * w @ cxy + vyy + c * c)
+
+    def loss_and_grad(self, w, b):
+        """(MSE, dMSE/dw, dMSE/db)"""
+        w, b = self._params(w, b)
+        mx, my, cxx, cxy, vyy = self.moments()
+        c = w @ mx + b - my
+        cw = cxx @ w
+        loss = float(w @ cw - 2 * w @ cxy + vyy + c * c)
+        return loss, self._unparam(2 * (cw - cxy + c * mx)), float(2 * c)
+
+    def losses(self, params):
+        """一次計算多組參數的 MSE：params 形狀 (P, d + 1)，每列為 (w_1, ..., w_d, b)"""
+        return quadratic_loss(self.moments(), params)
+
+    def batch_loss_and_grad(self, w, b, start, stop):
+        """只用第 start ~ stop-1 筆資料 (mini-batch) 直接以向量化內積計算 (MSE, dw, db)"""
+        w, b = self._params(w, b)
+        sse, gw, gb = 0.0, np.zeros(self.d), 0.0
+        for xc, yc in self.chunks(start, stop):
+            r = xc @ w + b - yc
+            sse += r @ r
+            gw += xc.T @ r
+            gb += r.sum()
+        m = stop - start
+        return float(sse / m), self._unparam(2 * gw / m), float(2 * gb / m)
+
+
+def quadratic_loss(moments, params):
+    """
+    由統計量 (Dataset.moments()) 計算 params (P, d + 1) 每一列的 MSE，回傳長度 P 的陣列。
+    只依賴統計量而不碰資料本身，可以便宜地傳給其他 process。
+    """
+    mx, my, cxx, cxy, vyy = moments
+    params = np.asarray(params, dtype=np.float64)
+    W, b = params[:, :-1], params[:, -1]
+    c = W @ mx + b - my
+    return np.einsum("pi,pi->p", W @ cxx, W) - 2 * (W @ cxy) + vyy + c * c
+
+
+# ---------- 求解器 ----------
+def fit_closed_form(data):
+    """最小平方法的解析解：Cxx w = cxy，b = my - w·mx"""
+    mx, my, cxx, cxy, _ = data.moments()
+    w = np.linalg.lstsq(cxx, cxy, rcond=None)[0]
+    return data._unparam(w), float(my - w @ mx)
+
+
+def fit_gradient_descent(data, iterations=1000, lr=0.001, w=0.0, b=0.0, tol=None):
+    """
+    全批次梯度下降 (與原本 greedy.gradient_descent 相同的更新式)。
+    梯度由統計量直接算出，每一步 O(d²)；給 tol 時梯度夠小就提早停止。
+    """
+    w, b = data._params(w, b)
+    for _ in range(iterations):
+        _, gw, gb = data.loss_and_grad(w, b)
+        gw = np.atleast_1d(gw)
+        if tol is not None and max(np.abs(gw).max(), abs(gb)) < tol:
+            break
+        w = w - lr * gw
+        b = b - lr * gb
+    return data._unparam(w), b
+
+
+def fit_minibatch(data, epochs=1, batch_size=4096, lr=0.001, w=0.0, b=0.0, seed=None):
+    """
+    mini-batch SGD：每個 epoch 以隨機順序走過連續的區塊
+    (打亂的是區塊順序而不是個別資料點，memmap 時仍是循序讀取)。
+    """
+    rng = np.random.default_rng(seed)
+    w, b = data._params(w, b)
+    starts = np.arange(0, data.n, batch_size)
+    for _ in range(epochs):
+        for s in rng.permutation(starts):
+            _, gw, gb = data.batch_loss_and_grad(w, b, s, min(s + batch_size, data.n))
+            w = w - lr * np.atleast_1d(gw)
+            b = b - lr * gb
+    return data._unparam(w), b
+
+
+SOLVERS = {"closed": fit_closed_form, "gd": fit_gradient_descent, "minibatch": fit_minibatch}
+
+
+def fit(data, method="closed", **options):
+    """以指定的方法 ("closed" / "gd" / "minibatch") 擬合，回傳 (w, b)"""
+    try:
+        solver = SOLVERS[method]
+    except KeyError:
+        raise ValueError(f"未知的求解方法: {method}") from None
+    return solver(data, **options)
@@ -0,0 +1,345 @@
+import numpy as np
+
+
+class BitGrid:
+    """
+    每格 1 bit 的二維旗標 (牆壁或已拜訪)，以 np.packbits 的格式存放：
+    bits[r] 為第 r 列，第 c 格在 bits[r, c // 8] 的第 c % 8 個 bit (bitorder="little")。
+    與 int64 迷宮 + bool 拜訪表 (每格 9 bytes) 相比，一張 BitGrid 每格只佔 1/8 byte。
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.bits = np.zeros((rows, (cols + 7) // 8), dtype=np.uint8)
+
+    @classmethod
+    def from_array(cls, maze):
+        """由 0/1 (或 bool) 的二維陣列建立，非 0 視為 1"""
+        maze = np.asarray(maze)
+        grid = cls(*maze.shape)
+        grid.bits[...] = np.packbits(maze != 0, axis=1, bitorder="little")
+        return grid
+
+    @classmethod
+    def wrap(cls, bits, cols):
+        """直接使用現成的 packed 陣列 (例如 np.memmap)，不複製"""
+        grid = cls.__new__(cls)
+        grid.rows = bits.shape[0]
+        grid.cols = cols
+        grid.bits = bits
+        return grid
+
+    def to_array(self):
+        return self.unpack_rows(0, self.rows)
+
+    def unpack_rows(self, r0, r1):
+        """第 r0 ~ r1-1 列展開成 (r1 - r0, cols) 的 bool 陣列"""
+        return np.unpackbits(self.bits[r0:r1], axis=1, count=self.cols, bitorder="little").astype(bool)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def __getitem__(self, pos):
+        r, c = pos
+        return bool(self.bits[r, c >> 3] >> (c & 7) & 1)
+
+    def __setitem__(self, pos, value):
+        r, c = pos
+        if value:
+            self.bits[r, c >> 3] |= 1 << (c & 7)
+        else:
+            self.bits[r, c >> 3] &= ~(1 << (c & 7)) & 0xFF
+
+    def row_int(self, r):
+        """第 r 列轉成 Python int (第 c 格為第 c 個 bit)，整列的位元運算一次完成"""
+        return int.from_bytes(self.bits[r].tobytes(), "little")
+
+
+# JPS 水平掃描的起始視窗 (bytes)，找不到牆壁或跳點時加倍
+JUMP_WINDOW = 8
+
+# 展開的跳點超過全部格子的這個比例時 (例如終點不可達，必須走遍整個連通區域)，
+# 改用向量化的 packed BFS 比較快
+JPS_BUDGET_FRACTION = 1 / 256
+JPS_MIN_BUDGET = 4096   # 小地圖直接跑完 JPS
+
+
+class _JumpGrid:
+    """
+    JPS 用的列快取：每列的 packed bytes (每格 1 bit，與 BitGrid.bits 相同)。
+    水平掃描只把 c 附近的一小段 bytes 轉成 Python int，
+    每次的成本與「到下一個牆壁或跳點的距離」成正比，而不是整列的寬度。
+    """
+
+    def __init__(self, walls, goal):
+        self.walls = walls
+        self.goal = goal
+        self.nbytes = walls.bits.shape[1]
+        self.solid = b"\xff" * self.nbytes        # 上下邊界外的整列牆壁
+        self._rows = {}
+
+    def row(self, r):
+        if not 0 <= r < self.walls.rows:
+            return self.solid
+        w = self._rows.get(r)
+        if w is None:
+            w = self.walls.bits[r].tobytes()
+            self._rows[r] = w
+        return w
+
+    def is_wall(self, r, c):
+        if not 0 <= c < self.walls.cols:
+            return 1
+        return self.row(r)[c >> 3] >> (c & 7) & 1
+
+    def _window(self, r, b0, b1):
+        """
+        第 b0 ~ b1-1 個 byte 的 (牆壁, 上一列, 下一列) Python int，
+        右邊界外 (含最後一個 byte 多出來的 bits) 一律視為牆壁。
+        """
+        w = int.from_bytes(self.row(r)[b0:b1], "little")
+        up = int.from_bytes(self.row(r - 1)[b0:b1], "little")
+        down = int.from_bytes(self.row(r + 1)[b0:b1], "little")
+        if b1 >= self.nbytes:
+            outside = -1 << (self.walls.cols - 8 * b0)
+            w, up, down = w | outside, up | outside, down | outside
+        return w, up, down
+
+    def jump_h(self, r, c, dx):
+        """
+        由 (r, c) 水平往 dx 走，回傳跳點的欄，沒有則回傳 None。
+        往 dx 走到第 x 格時，若上 (下) 方是空的、但前一格的上 (下) 方是牆，
+        第 x 格就有 forced neighbor；終點也算跳點。先遇到牆就沒有跳點。
+        視窗多取一個 byte，讓前一格 (x - dx) 的上下方也在視窗內。
+        """
+        goal = self.goal[1] if self.goal[0] == r else -1
+        k = JUMP_WINDOW
+        if dx > 0:
+            while True:
+                b0 = max(0, (c >> 3) - 1)
+                b1 = (c + 1 >> 3) + k
+                w, up, down = self._window(r, b0, b1)
+                base = 8 * b0
+                forced = (~up & (up << 1)) | (~down & (down << 1))
+                if goal > c:
+                    forced |= 1 << (goal - base)
+                shift = c + 1 - base
+                w >>= shift
+                forced >>= shift
+                wall = (w & -w).bit_length() - 1          # -1：視窗內沒有牆
+                hit = (forced & -forced).bit_length() - 1
+                if wall >= 0:
+                    return c + 1 + hit if 0 <= hit < wall else None
+                if 0 <= hit < 8 * (b1 - b0) - shift:
+                    return c + 1 + hit
+                c = 8 * b1 - 1    # 視窗內沒有牆也沒有跳點，從下一個 byte 繼續
+                k *= 2
+        else:
+            while True:
+                b1 = min(self.nbytes, (c >> 3) + 2)
+                b0 = max(0, (c >> 3) - k)
+                w, up, down = self._window(r, b0, b1)
+                base = 8 * b0
+                forced = (~up & (up >> 1)) | (~down & (down >> 1))
+                if base <= goal < c:
+                    forced |= 1 << (goal - base)
+                below = (1 << (c - base)) - 1
+                wall = (w & below).bit_length() - 1
+                hit = (forced & below).bit_length() - 1
+                if wall >= 0 or b0 == 0:
+                    # 視窗已包含第 0 欄時，左邊界外視為牆壁 (wall = -1)
+                    return base + hit if hit > wall else None
+                if hit >= 0:
+                    return base + hit
+                c = base
+                k *= 2
+
+    def jump_v(self, r, c, dy):
+        """
+        由 (r, c) 垂直往 dy 跳，回傳跳點的列，沒有則回傳 None。
+        垂直移動後可自然轉向水平，因此某一格往左或往右能跳到跳點時，該格就是跳點。
+        """
+        while True:
+            r += dy
+            if self.is_wall(r, c):
+                return None
+            if (r, c) == self.goal:
+                return r
+            if self.jump_h(r, c, 1) is not None or self.jump_h(r, c, -1) is not None:
+                return r
+
+
+# packed BFS 的每格標記：BFS 距離 mod 3 (0 ~ 2)，3 表示尚未拜訪
+_UNSEEN = 3
+_MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _codes_get(codes, i):
+    return (codes[i >> 2] >> ((i & 3) << 1)) & 3
+
+
+def _packed_bfs(walls, start, goal):
+    """
+    牆壁維持 packed (可為 memmap) 的向量化 BFS，回傳最短路徑，找不到時回傳 None。
+
+    每格只用 2 bit 記錄「BFS 距離 mod 3」(3 表示未拜訪)，同時當作拜訪旗標與 parent：
+    相鄰格子的距離最多差 1，所以從終點往回走時，標記為 (d - 1) mod 3 的鄰居
+    距離必定是 d - 1，不需要另外存 parent。frontier 以格子編號的陣列整層展開，
+    牆壁直接讀 walls.bits 中對應的 bit，只有 frontier 經過的頁面會被讀進記憶體。
+    """
+    rows, cols = walls.rows, walls.cols
+    bits = walls.bits
+    codes = np.full((rows * cols + 3) // 4, 0xFF, dtype=np.uint8)
+
+    def mark(i, level):
+        # 把 2 bit 的 11 清成 level mod 3；同一個 byte 可能出現多次，需用 ufunc.at
+        clear = ((_UNSEEN ^ (level % 3)) << ((i & 3) << 1)).astype(np.uint8)
+        np.bitwise_and.at(codes, i >> 2, ~clear)
+
+    g = goal[0] * cols + goal[1]
+    frontier = np.array([start[0] * cols + start[1]], dtype=np.int64)
+    mark(frontier, 0)
+    level = 0
+    while len(frontier) and _codes_get(codes, g) == _UNSEEN:
+        level += 1
+        r, c = np.divmod(frontier, cols)
+        inside = (r > 0, r < rows - 1, c > 0, c < cols - 1)     # 與 _MOVES 的順序相同
+        found = []
+        for (dr, dc), ok in zip(_MOVES, inside):
+            nr, nc = r[ok] + dr, c[ok] + dc
+            i = frontier[ok] + (dr * cols + dc)
+            i = i[(bits[nr, nc >> 3] >> (nc & 7) & 1) == 0]
+            i = i[_codes_get(codes, i) == _UNSEEN]
+            # 同一個方向內不會重複；先標記再處理下一個方向，跨方向也不會重複
+            mark(i, level)
+            found.append(i)
+        frontier = np.concatenate(found)
+
+    if _codes_get(codes, g) == _UNSEEN:
+        return None
+
+    # 由終點沿著距離遞減的鄰居走回起點
+    path = [goal]
+    r, c = goal
+    for d in range(level, 0, -1):
+        want = (d - 1) % 3
+        for dr, dc in _MOVES:
+            rr, cc = r + dr, c + dc
+            if 0 <= rr < rows and 0 <= cc < cols and _codes_get(codes, rr * cols + cc) == want:
+                r, c = rr, cc
+                break
+        path.append((r, c))
+    path.reverse()
+    return path
+
+
+def jump_point_search(maze, start, goal, stats=None):
+    """
+    4 連通格子上的 Jump Point Search，回傳最短路徑 [(row, col), ...]，找不到時回傳 None。
+
+    正規路徑為「能先垂直就先垂直」：水平移動時只有出現 forced neighbor 才允許轉向垂直，
+    同一段直線上對稱的走法全部略過，優先佇列裡只放跳點。
+    牆壁 (BitGrid) 與已拜訪旗標都是每格 1 bit，g 值與 parent 只記錄跳點。
+    展開的跳點超過 JPS_BUDGET_FRACTION 時改用 _packed_bfs (結果一樣是最短路徑)，
+    牆壁仍然維持 packed，另外只需要每格 2 bit 的標記，整個過程都不會展開成密集的表。
+    maze 可以是 BitGrid 或 0/1 陣列；stats 若給 dict，會寫入展開的跳點數 "expanded"
+    與是否改用 BFS ("fallback")。
+    """
+    walls = maze if isinstance(maze, BitGrid) else BitGrid.from_array(maze)
+    for r, c in (start, goal):
+        if not (0 <= r < walls.rows and 0 <= c < walls.cols):
+            raise ValueError(f"座標 {(r, c)} 超出迷宮範圍")
+    if walls[start] or walls[goal]:
+        return None
+
+    grid = _JumpGrid(walls, goal)
+    cols = walls.cols
+    closed = bytearray((walls.rows * cols + 7) // 8)   # 已展開的格子，每格 1 bit
+    gr, gc = goal
+    cost = {start: 0}
+    parent = {start: None}
+    came = {start: None}
+    # 跳點之間的成本就是曼哈頓距離，f 只會增加偶數：以 f 為鍵的桶子取代 heap，
+    # 同一個 f 內後進先出 (與 maze_solver.solve_astar 相同)
+    f = abs(start[0] - gr) + abs(start[1] - gc)
+    buckets = {f: [start]}
+    current = buckets[f]
+    expanded = 0
+    budget = max(JPS_MIN_BUDGET, int(JPS_BUDGET_FRACTION * walls.rows * cols))
+
+    while True:
+        if not current:
+            del buckets[f]
+            if not buckets:
+                break
+            f = min(buckets)
+            current = buckets[f]
+        node = current.pop()
+        r, c = node
+        i = r * cols + c
+        if closed[i >> 3] >> (i & 7) & 1:
+            continue
+        closed[i >> 3] |= 1 << (i & 7)
+        expanded += 1
+        if node == goal:
+            break
+        if expanded > budget:
+            if stats is not None:
+                stats.update(expanded=expanded, fallback=True)
+            del closed, cost, parent, came, buckets, current, grid
+            return _packed_bfs(walls, start, goal)
+
+        d = came[node]
+        if d is None:
+            dirs = ((-1, 0), (1, 0), (0, -1), (0, 1))
+        elif d[0] == 0:
+            # 水平到達：只有被牆擋住的垂直方向是 forced
+            dx = d[1]
+            dirs = [d] + [(dy, 0) for dy in (-1, 1)
+                          if not grid.is_wall(r + dy, c) and grid.is_wall(r + dy, c - dx)]
+        else:
+            dirs = (d, (0, -1), (0, 1))
+
+        g = cost[node]
+        found = []
+        for dr, dc in dirs:
+            if dr == 0:
+                col = grid.jump_h(r, c, dc)
+                if col is None:
+                    continue
+                nxt = (r, col)
+            else:
+                row = grid.jump_v(r, c, dr)
+                if row is None:
+                    continue
+                nxt = (row, c)
+            step = g + abs(nxt[0] - r) + abs(nxt[1] - c)
+            if step < cost.get(nxt, step + 1):
+                cost[nxt] = step
+                parent[nxt] = node
+                came[nxt] = (dr, dc)
+                found.append(nxt)
+
+        # 剩餘距離較平均 (較接近對角線) 的跳點最後放入、最先展開，比較不會撞到邊界再回頭
+        found.sort(key=lambda p: -max(abs(p[0] - gr), abs(p[1] - gc)))
+        for nxt in found:
+            buckets.setdefault(cost[nxt] + abs(nxt[0] - gr) + abs(nxt[1] - gc), []).append(nxt)
+
+    if stats is not None:
+        stats.update(expanded=expanded, fallback=False)
+    if goal not in parent:
+        return None
+
+    # 跳點之間都是直線，補回中間的格子
+    jumps = [goal]
+    while parent[jumps[-1]] is not None:
+        jumps.append(parent[jumps[-1]])
+    jumps.reverse()
+    path = [start]
+    for (r0, c0), (r1, c1) in zip(jumps, jumps[1:]):
+        dr, dc = (r1 > r0) - (r1 < r0), (c1 > c0) - (c1 < c0)
+        for k in range(1, abs(r1 - r0) + abs(c1 - c0) + 1):
+            path.append((r0 + dr * k, c0 + dc * k))
+    return path
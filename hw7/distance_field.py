@@ -0,0 +1,181 @@
+import numpy as np
+
+from maze_solver import Grid
+
+# 走不到 (或牆壁) 的格子
+UNREACHABLE = -1
+
+# 加牆後作廢的格子超過全部格子的這個比例時，直接整張重算比局部修補快
+REBUILD_FRACTION = 0.0625
+
+
+class DistanceField:
+    """
+    以終點為起點做一次 BFS，記下每一格到終點的步數 (int32)，
+    之後任何起點的最短路徑都只要沿著「距離減一」的鄰居往下走，時間 O(路徑長)。
+
+    牆壁少量增減時用 update() 局部修補，不必整張重算：
+    - 加牆：只作廢「所有最短路徑都經過新牆」的格子，再從周圍重新填回
+    - 拆牆：距離只會變小，從新打通的格子往外鬆弛即可
+    """
+
+    def __init__(self, maze, goal):
+        self.grid = Grid(maze)
+        self.goal = goal
+        g = self.grid.index(goal)
+        if not self.grid.free[g]:
+            raise ValueError(f"終點 {goal} 是牆壁")
+        self._goal = g
+        self._moves = np.array(self.grid.moves, dtype=np.int64)
+
+        self.dist = np.full(self.grid.size, UNREACHABLE, dtype=np.int32)
+        self._wavefront(g)
+
+    def _wavefront(self, g):
+        """整層 frontier 一次推進的 BFS"""
+        grid, dist = self.grid, self.dist
+        unseen = grid.free.copy()
+        unseen[g] = False
+        dist[g] = 0
+        frontier = np.array([g], dtype=grid.index_dtype)
+        d = 0
+        while len(frontier):
+            d += 1
+            layer = []
+            for move in grid.moves:
+                nb = frontier + move
+                nb = nb[unseen[nb]]
+                unseen[nb] = False
+                layer.append(nb)
+            frontier = np.concatenate(layer)
+            dist[frontier] = d
+
+    # ---------- 查詢 ----------
+    def distance(self, pos):
+        """pos 到終點的步數，走不到時回傳 None"""
+        d = int(self.dist[self.grid.index(pos)])
+        return None if d == UNREACHABLE else d
+
+    def distances(self):
+        """(rows, cols) 的距離表 (走不到為 -1)，為內部陣列的 view"""
+        rows, cols = self.grid.shape
+        return self.dist.reshape(rows + 2, cols + 2)[1:-1, 1:-1]
+
+    def path_from(self, start):
+        """start -> 終點的最短路徑 [(row, col), ...]，走不到時回傳 None"""
+        node = self.grid.index(start)
+        d = int(self.dist[node])
+        if d == UNREACHABLE:
+            return None
+
+        dist, moves = self.dist, self.grid.moves
+        path = [node]
+        while d > 0:
+            for move in moves:
+                if dist[node + move] == d - 1:
+                    node += move
+                    break
+            d -= 1
+            path.append(node)
+        return self.grid.positions(path)
+
+    # ---------- 增量更新 ----------
+    def update(self, add=(), remove=()):
+        """
+        add：新增牆壁的座標；remove：拆除牆壁的座標。
+        更新後的距離與整張重算的結果相同。
+        """
+        grid, dist = self.grid, self.dist
+        budget = int(REBUILD_FRACTION * grid.size)
+        invalid = []
+
+        for pos in add:
+            node = grid.index(pos)
+            if node == self._goal:
+                raise ValueError(f"不能在終點 {pos} 放牆壁")
+            if not grid.free[node]:
+                continue
+            grid.free[node] = False
+            if budget >= 0:
+                removed = self._invalidate(node, budget)
+                budget = -1 if removed is None else budget - len(removed)
+                invalid.append(removed)
+
+        seeds = []
+        for pos in remove:
+            node = grid.index(pos)
+            if not grid.free[node]:
+                grid.free[node] = True
+                seeds.append(np.array([node]))
+
+        if budget < 0:
+            dist.fill(UNREACHABLE)
+            self._wavefront(self._goal)
+            return
+
+        # 從作廢區域與新打通格子的周圍 (距離仍有效的格子) 開始往外鬆弛
+        if invalid or seeds:
+            touched = np.concatenate(invalid + seeds)
+            around = (touched[:, None] + self._moves).ravel()
+            around = np.unique(around[dist[around] != UNREACHABLE])
+            self._relax(around)
+
+    def _invalidate(self, wall, budget):
+        """
+        新牆讓某些格子失去最短路徑：逐層找出「上一層已沒有距離少一的有效鄰居」的格子，
+        把它們設為 UNREACHABLE，回傳所有作廢的格子。
+        作廢的格子超過 budget 時提早停止並回傳 None (呼叫端改為整張重算)。
+        """
+        dist, moves = self.dist, self._moves
+        d = int(dist[wall])
+        dist[wall] = UNREACHABLE
+        if d == UNREACHABLE:
+            return np.array([wall])
+
+        removed = [np.array([wall])]
+        frontier = removed[0]
+        count = 1
+        while len(frontier):
+            cand = (frontier[:, None] + moves).ravel()
+            cand = np.unique(cand[dist[cand] == d + 1])
+            supported = (dist[cand[:, None] + moves] == d).any(axis=1)
+            frontier = cand[~supported]
+            dist[frontier] = UNREACHABLE
+            removed.append(frontier)
+            count += len(frontier)
+            if count > budget:
+                return None
+            d += 1
+        return np.concatenate(removed)
+
+    def _relax(self, seeds):
+        """
+        從 seeds (距離已知的格子) 往外重新填距離，距離只會變小。
+        依距離由小到大一層一層推進 (各 seed 在自己的距離那一層加入 frontier)，
+        每一格只會被確定一次，與建表時的 BFS 相同。
+        """
+        grid, dist = self.grid, self.dist
+        seeds = seeds[np.argsort(dist[seeds], kind="stable")]
+        levels = dist[seeds]
+
+        frontier = seeds[:0]
+        d = int(levels[0]) if len(seeds) else 0
+        pos = 0
+        while len(frontier) or pos < len(seeds):
+            if not len(frontier):
+                d = max(d, int(levels[pos]))
+            # 這一層加入的 seed (若已被更短的距離更新過就略過)
+            end = np.searchsorted(levels, d, side="right")
+            joined = seeds[pos:end]
+            pos = end
+            frontier = np.concatenate([frontier, joined[dist[joined] == d]])
+
+            layer = []
+            for move in grid.moves:
+                nb = frontier + move
+                old = dist[nb]
+                nb = nb[grid.free[nb] & ((old == UNREACHABLE) | (old > d + 1))]
+                dist[nb] = d + 1
+                layer.append(nb)
+            frontier = np.concatenate(layer)
+            d += 1
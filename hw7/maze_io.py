@@ -0,0 +1,124 @@
+import argparse
+import struct
+import sys
+
+import numpy as np
+
+from bitgrid import BitGrid
+
+# 檔案格式：header (magic, 版本, rows, cols) + 每列 ceil(cols / 8) bytes 的 packed 牆壁 bits
+# (與 BitGrid.bits 相同的 layout)，載入時直接 np.memmap，不讀進記憶體
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQ")
+
+# 寫檔 / 渲染時每次處理幾列
+CHUNK_ROWS = 1024
+
+WALL, OPEN, PATH, START, END = "█", " ", ".", "S", "E"
+# 縮圖時依區塊內牆壁比例選字元
+SHADES = np.array([" ", "░", "▒", "▓", "█"])
+
+
+def create_maze(path, rows, cols):
+    """建立全空的迷宮檔並以可寫入的 memmap 開啟，用來產生放不進記憶體的大地圖"""
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, rows, cols))
+        f.truncate(HEADER.size + rows * ((cols + 7) // 8))
+    return load_maze(path, mode="r+")
+
+
+def save_maze(path, maze):
+    """maze 可以是 BitGrid 或 0/1 陣列；分段寫入，不會一次展開整張圖"""
+    if isinstance(maze, BitGrid):
+        rows, cols = maze.rows, maze.cols
+    else:
+        maze = np.asarray(maze)
+        rows, cols = maze.shape
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, rows, cols))
+        for r0 in range(0, rows, CHUNK_ROWS):
+            r1 = min(r0 + CHUNK_ROWS, rows)
+            if isinstance(maze, BitGrid):
+                f.write(np.ascontiguousarray(maze.bits[r0:r1]).tobytes())
+            else:
+                f.write(np.packbits(maze[r0:r1] != 0, axis=1, bitorder="little").tobytes())
+
+
+def load_maze(path, mode="r"):
+    """以 np.memmap 載入迷宮檔，回傳 BitGrid (只有實際存取到的部分會被讀進記憶體)"""
+    with open(path, "rb") as f:
+        magic, version, rows, cols = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} 不是迷宮檔")
+    if version != VERSION:
+        raise ValueError(f"不支援的迷宮檔版本: {version}")
+
+    shape = (rows, (cols + 7) // 8)
+    bits = np.memmap(path, dtype=np.uint8, mode=mode, offset=HEADER.size, shape=shape)
+    return BitGrid.wrap(bits, cols)
+
+
+def _path_marks(path, scale):
+    """路徑座標依 (縮圖後的) 列分組：{列: [(欄, 字元), ...]}，起點 / 終點最後放以免被蓋掉"""
+    marks = {}
+    if not path:
+        return marks
+    for r, c in path[1:-1]:
+        marks.setdefault(r // scale, []).append((c // scale, PATH))
+    for (r, c), ch in ((path[0], START), (path[-1], END)):
+        marks.setdefault(r // scale, []).append((c // scale, ch))
+    return marks
+
+
+def render(maze, path=None, out=None, max_cols=None, max_rows=None):
+    """
+    逐列輸出迷宮與路徑 (█ 牆壁、. 路徑、S 起點、E 終點)，每次只展開一段列，
+    不會建立整張字元陣列。
+    給 max_cols / max_rows 時把迷宮縮成不超過該大小的縮圖：每個字元代表 scale x scale 的區塊，
+    以牆壁比例選擇深淺 ( ░▒▓█)，區塊內有路徑就標上路徑。
+    """
+    out = sys.stdout if out is None else out
+    grid = maze if isinstance(maze, BitGrid) else BitGrid.from_array(maze)
+    rows, cols = grid.rows, grid.cols
+
+    scale = 1
+    if max_cols:
+        scale = max(scale, -(-cols // max_cols))
+    if max_rows:
+        scale = max(scale, -(-rows // max_rows))
+    marks = _path_marks(path, scale)
+    out_cols = -(-cols // scale)
+
+    # 縮圖時一次只處理一列區塊 (scale 列)
+    step = CHUNK_ROWS if scale == 1 else scale
+    for r0 in range(0, rows, step):
+        walls = grid.unpack_rows(r0, min(r0 + step, rows))
+        if scale == 1:
+            chars = np.where(walls, WALL, OPEN)
+        else:
+            # 補齊成 scale 的倍數後計算每個區塊的牆壁比例 (邊界外視為牆壁)
+            blocks = np.pad(walls, ((0, scale - len(walls)), (0, out_cols * scale - cols)),
+                            constant_values=True)
+            count = blocks.reshape(scale, out_cols, scale).sum(axis=(0, 2), dtype=np.int64)
+            level = np.rint(count * (len(SHADES) - 1) / (scale * scale)).astype(int)
+            chars = SHADES[level][None, :]
+
+        for i, row in enumerate(chars):
+            for c, ch in marks.get(r0 // scale + i, ()):
+                row[c] = ch
+            out.write(" ".join(row) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="顯示迷宮檔 (可縮圖)")
+    parser.add_argument("file")
+    parser.add_argument("--max-cols", type=int, default=None, help="縮圖的最大寬度")
+    parser.add_argument("--max-rows", type=int, default=None, help="縮圖的最大高度")
+    args = parser.parse_args(argv)
+    render(load_maze(args.file), max_cols=args.max_cols, max_rows=args.max_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+from array import array
+
+import numpy as np
+
+from bitgrid import BitGrid, jump_point_search
+
+# 由 BitGrid (例如 memmap 載入的大地圖) 建表時，每次展開幾列
+UNPACK_ROWS = 1024
+
+# A* 逐格展開 (純 Python) 超過全部格子的這個比例時，改用向量化的 BFS 比較快
+# (例如終點不可達、必須走遍整個連通區域時)
+ASTAR_BUDGET_FRACTION = 1 / 64
+ASTAR_MIN_BUDGET = 4096   # 小地圖直接跑完 A*
+
+# 迷宮格子：0 為通道、非 0 為牆壁 (也可以是 BitGrid)；座標一律為 (row, col)
+# 內部把迷宮外圍補一圈牆壁後攤平成一維，鄰居 = 索引 + 位移，不必再檢查邊界
+
+
+class Grid:
+    """
+    補上外框牆壁並攤平的迷宮，dfs / bfs / astar 共用。
+    BitGrid (包括 maze_io.load_maze 的 memmap) 會分段展開成每格 1 byte 的 bool 表，
+    是檔案大小的 8 倍，搜尋時另需每格 4 ~ 8 bytes 的 parent / cost；
+    放不進記憶體的地圖請用 jump_point_search ("jps")：牆壁與拜訪旗標維持每格 1 bit，
+    超過預算改走 BFS 時也只多用每格 2 bit 的標記，不會建立這張表。
+    """
+
+    def __init__(self, maze):
+        if not isinstance(maze, BitGrid):
+            maze = np.asarray(maze)
+            self.shape = maze.shape
+        else:
+            self.shape = (maze.rows, maze.cols)
+        rows, cols = self.shape
+        self.width = cols + 2
+        self.size = (rows + 2) * self.width
+
+        free = np.zeros((rows + 2, cols + 2), dtype=bool)
+        if isinstance(maze, BitGrid):
+            for r0 in range(0, rows, UNPACK_ROWS):
+                r1 = min(r0 + UNPACK_ROWS, rows)
+                free[1 + r0:1 + r1, 1:-1] = ~maze.unpack_rows(r0, r1)
+        else:
+            free[1:-1, 1:-1] = maze == 0
+        self.free = free.ravel()
+
+        # 上、下、左、右 (與原本 dfs 的 move 順序相同)
+        self.moves = (-self.width, self.width, -1, 1)
+        self.index_dtype = np.int32 if self.size < 2**31 else np.int64
+
+    def index(self, pos):
+        r, c = pos
+        if not (0 <= r < self.shape[0] and 0 <= c < self.shape[1]):
+            raise ValueError(f"座標 {pos} 超出迷宮範圍")
+        return (r + 1) * self.width + (c + 1)
+
+    def positions(self, indices):
+        """攤平的索引 -> [(row, col), ...]"""
+        r, c = np.divmod(np.asarray(indices, dtype=np.int64), self.width)
+        return list(zip((r - 1).tolist(), (c - 1).tolist()))
+
+    def trace(self, parent, goal):
+        """由 parent 陣列從終點往回走，只在最後重建一次路徑"""
+        path = [goal]
+        node = goal
+        while parent[node] >= 0:
+            node = int(parent[node])
+            path.append(node)
+        path.reverse()
+        return self.positions(path)
+
+
+def _endpoints(grid, start, goal):
+    s, g = grid.index(start), grid.index(goal)
+    if not (grid.free[s] and grid.free[g]):
+        return None
+    return s, g
+
+
+def solve_dfs(maze, start, goal):
+    """
+    深度優先搜尋 (明確的堆疊，不遞迴)。
+    探索順序與原本遞迴版 dfs 相同，因此找到的路徑也相同；
+    堆疊本身就是目前的路徑，找到終點時直接轉成座標，不會每一步複製 path。
+    找不到時回傳 None。
+    """
+    grid = Grid(maze)
+    ends = _endpoints(grid, start, goal)
+    if ends is None:
+        return None
+    s, g = ends
+
+    free = bytearray(grid.free.tobytes())  # 逐格存取時 bytearray 比 NumPy 快
+    moves = grid.moves
+    free[s] = 0
+    stack = [s]
+    next_move = [0]
+    while stack:
+        node = stack[-1]
+        if node == g:
+            return grid.positions(stack)
+
+        k = next_move[-1]
+        while k < 4 and not free[node + moves[k]]:
+            k += 1
+        if k == 4:
+            stack.pop()
+            next_move.pop()
+            continue
+
+        next_move[-1] = k + 1
+        nxt = node + moves[k]
+        free[nxt] = 0
+        stack.append(nxt)
+        next_move.append(0)
+    return None
+
+
+def solve_bfs(maze, start, goal):
+    """
+    廣度優先搜尋，回傳最短路徑 (格數最少)；找不到時回傳 None。
+    以整層 frontier 為單位向量化展開：每一層對四個方向各做一次陣列運算，
+    parent 記錄在攤平的 NumPy int 陣列中。
+    """
+    grid = Grid(maze)
+    ends = _endpoints(grid, start, goal)
+    if ends is None:
+        return None
+    return _bfs(grid, *ends)
+
+
+def _bfs(grid, s, g):
+    free = grid.free.copy()
+    parent = np.full(grid.size, -1, dtype=grid.index_dtype)
+    free[s] = False
+    frontier = np.array([s], dtype=grid.index_dtype)
+
+    while len(frontier) and free[g]:
+        layer = []
+        for move in grid.moves:
+            nb = frontier + move
+            ok = free[nb]
+            nb = nb[ok]
+            # 同一個方向內不會重複；先標記再處理下一個方向，跨方向也不會重複
+            free[nb] = False
+            parent[nb] = frontier[ok]
+            layer.append(nb)
+        frontier = np.concatenate(layer)
+
+    if free[g]:
+        return None  # 終點從未被走到
+    return grid.trace(parent, g)
+
+
+def solve_astar(maze, start, goal):
+    """
+    A* 搜尋 (曼哈頓距離啟發函數)，回傳最短路徑；找不到時回傳 None。
+    每步成本為 1，往終點走一步 f 不變、遠離終點 f 加 2，
+    所以不需要 heap：只用兩個桶子 (f 與 f + 2 的 list) 當優先佇列，
+    同一個 f 內後進先出 (優先展開 g 較大、較接近終點的點)。
+    f 相同的鄰居中，沿剩餘距離較長的那一軸前進的最後放入 (最先展開)，
+    大致沿著對角線逼近終點，比較不會一路撞到邊界再回頭。
+    cost / parent 放在 array 中 (逐格存取比 NumPy 純量索引快很多)，
+    展開過的格子直接在 free 中標成牆壁，不需要另外的 closed 表。
+    展開的格子超過 ASTAR_BUDGET_FRACTION (且至少 ASTAR_MIN_BUDGET) 時 (例如終點不可達) 改用向量化的 BFS，
+    結果一樣是最短路徑。
+    """
+    grid = Grid(maze)
+    ends = _endpoints(grid, start, goal)
+    if ends is None:
+        return None
+    s, g = ends
+
+    width = grid.width
+    gr, gc = divmod(g, width)
+    free = bytearray(grid.free.tobytes())
+    typecode = "i" if grid.index_dtype == np.int32 else "q"
+    cost = array(typecode, [-1]) * grid.size
+    parent = array(typecode, [-1]) * grid.size
+
+    cost[s] = 0
+    current, later = [s], []
+    budget = max(ASTAR_MIN_BUDGET, int(ASTAR_BUDGET_FRACTION * grid.size))
+    while current or later:
+        if not current:
+            current, later = later, []
+        node = current.pop()
+        if not free[node]:
+            continue  # 已經以更小的 f 展開過
+        if node == g:
+            return grid.trace(parent, g)
+        free[node] = 0
+        budget -= 1
+        if budget < 0:
+            return _bfs(grid, s, g)
+
+        step = cost[node] + 1
+        r, c = divmod(node, width)
+        # 朝終點的方向放進目前的桶子，其餘放進 f + 2 的桶子
+        vertical = ((node - width, r > gr), (node + width, r < gr))
+        horizontal = ((node - 1, c > gc), (node + 1, c < gc))
+        moves = horizontal + vertical if abs(r - gr) > abs(c - gc) else vertical + horizontal
+        for nxt, closer in moves:
+            if free[nxt]:
+                old = cost[nxt]
+                if old < 0 or step < old:
+                    cost[nxt] = step
+                    parent[nxt] = node
+                    (current if closer else later).append(nxt)
+    return None
+
+
+SOLVERS = {"dfs": solve_dfs, "bfs": solve_bfs, "astar": solve_astar, "jps": jump_point_search}
+
+
+def solve(maze, start, goal, method="bfs"):
+    """
+    以指定的方法 ("dfs" / "bfs" / "astar" / "jps") 找出 start -> goal 的路徑。
+    maze 為 BitGrid 時只有 "jps" (包括它改用 BFS 的情況) 不會展開成密集的表 (見 Grid)。
+    """
+    try:
+        solver = SOLVERS[method]
+    except KeyError:
+        raise ValueError(f"未知的搜尋方法: {method}") from None
+    return solver(maze, start, goal)
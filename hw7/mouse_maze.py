@@ -1,83 +1,47 @@
-import numpy as np
+from maze_io import render
+from maze_solver import solve_dfs
 
-def dfs(maze_list):
-    maze = np.array(maze_list)
-    visit_maze = np.zeros_like(maze,dtype=bool)
-    visit_maze[start_pos[0],start_pos[1]] = True
-    
-    row, col = maze.shape
-    move = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
-    
-    def solve(current_pos, path):
-        r, c = current_pos
-        visit_maze[r,c] = True
-        
-        if current_pos == end_pos:
-            return path
-        
-        for x, y in move:
-            n_r, n_c = r+x,c+y
-            
-            if 0 <=n_r < row and 0 <= n_c and \
-            maze[n_r,n_c] == 0 and not visit_maze[n_r,n_c]:
-                new_path = path + [(n_r,n_c)]
-                result = solve((n_r,n_c),new_path)
-                
-                if result is not None:
-                    return result
-        return None
-    return solve(start_pos,[start_pos])    
+
+def dfs(maze_list, start_pos, end_pos):
+    """
+    由 start_pos 走到 end_pos 的路徑 (深度優先，找不到回傳 None)。
+    實作在 maze_solver.solve_dfs：明確的堆疊取代遞迴，大迷宮不會超過遞迴上限；
+    需要最短路徑時改用 maze_solver.solve_bfs / solve_astar。
+    """
+    return solve_dfs(maze_list, start_pos, end_pos)
 
 #---print---
-def print_maze_solution(maze_list, path):
+def print_maze_solution(maze_list, path, out=None, max_cols=None):
     """
     視覺化顯示迷宮和找到的路徑。
+    由 maze_io.render 逐列輸出，不會建立整張字元陣列；
+    迷宮太寬時可給 max_cols 只印縮圖。
     """
+    render(maze_list, path, out=out, max_cols=max_cols)
 
-    maze_viz = np.array(maze_list, dtype='<U1')
-    
-    # 轉換 1 為牆壁, 0 為空白
-    maze_viz[maze_viz == '1'] = '█'
-    maze_viz[maze_viz == '0'] = ' '
-    
-    # 標記路徑
-    if path:
-        for r, c in path:
-            maze_viz[r, c] = '.' # 路徑
-            
-        # 標記起點和終點
-        start_r, start_c = path[0]
-        end_r, end_c = path[-1]
-        maze_viz[start_r, start_c] = 'S' # 起點
-        maze_viz[end_r, end_c] = 'E' # 終點
-
-
-    for row in maze_viz:
-        print(" ".join(row))
-        
 # ---maze---
-maze_data = [
-    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-    [1, 0, 0, 1, 0, 0, 0, 1, 0, 1],
-    [1, 0, 0, 1, 0, 0, 0, 1, 0, 1],
-    [1, 0, 0, 0, 0, 1, 1, 0, 0, 1],
-    [1, 0, 1, 1, 1, 0, 0, 0, 0, 1],
-    [1, 0, 0, 0, 1, 0, 0, 0, 0, 1],
-    [1, 0, 1, 0, 0, 0, 1, 0, 0, 1],
-    [1, 0, 1, 1, 1, 0, 1, 1, 0, 1],
-    [1, 1, 0, 0, 0, 0, 0, 0, 0, 1],
-    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-]
-start_pos = (1, 1)
-end_pos = (8, 8)
+if __name__ == "__main__":
+    maze_data = [
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 1, 0, 0, 0, 1, 0, 1],
+        [1, 0, 0, 1, 0, 0, 0, 1, 0, 1],
+        [1, 0, 0, 0, 0, 1, 1, 0, 0, 1],
+        [1, 0, 1, 1, 1, 0, 0, 0, 0, 1],
+        [1, 0, 0, 0, 1, 0, 0, 0, 0, 1],
+        [1, 0, 1, 0, 0, 0, 1, 0, 0, 1],
+        [1, 0, 1, 1, 1, 0, 1, 1, 0, 1],
+        [1, 1, 0, 0, 0, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    ]
+    start_pos = (1, 1)
+    end_pos = (8, 8)
 
-found_path = dfs(maze_data)
-if found_path:
-    print("成功找到路徑！\n")
-    print_maze_solution(maze_data, found_path)
-    print("\n路徑座標：")
-    print(found_path)
-else:
-    print("找不到路徑。")
-    print_maze_solution(maze_data, None)
\ No newline at end of file
+    found_path = dfs(maze_data, start_pos, end_pos)
+    if found_path:
+        print("成功找到路徑！\n")
+        print_maze_solution(maze_data, found_path)
+        print("\n路徑座標：")
+        print(found_path)
+    else:
+        print("找不到路徑。")
+        print_maze_solution(maze_data, None)
\ No newline at end of file
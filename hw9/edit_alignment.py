@@ -0,0 +1,119 @@
+from collections import namedtuple
+
+# distance：總成本；ops：[(操作, i, j), ...]，i / j 為 word1 / word2 中的位置 (插入時 i、刪除時 j 為 None)
+# aligned1 / aligned2：對齊後的序列，字串以 "-" 表示空位，其他序列以 None 表示
+Alignment = namedtuple("Alignment", ["distance", "ops", "aligned1", "aligned2"])
+
+# 子問題小於這個格數時直接用完整 DP 表格回溯 (表格很小，不影響線性記憶體)
+BASE_CELLS = 4096
+
+
+def _last_row(a, b, ins_cost, del_cost, sub_cost):
+    """只用一列記憶體算出 a 轉成 b[:j] 的成本 (j = 0..n)"""
+    n = len(b)
+    prev = [j * ins_cost for j in range(n + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [i * del_cost] + [0] * n
+        x = a[i - 1]
+        for j in range(1, n + 1):
+            cur[j] = min(
+                prev[j] + del_cost,                                  # 刪除
+                cur[j - 1] + ins_cost,                               # 插入
+                prev[j - 1] + (0 if x == b[j - 1] else sub_cost),    # 相同 / 替換
+            )
+        prev = cur
+    return prev
+
+
+def _full_dp(a, b, i0, j0, ins_cost, del_cost, sub_cost, ops):
+    """小的子問題：完整 DP 表格 + 回溯，把操作附加到 ops"""
+    m, n = len(a), len(b)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(m + 1):
+        dp[i][0] = i * del_cost
+    for j in range(n + 1):
+        dp[0][j] = j * ins_cost
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            dp[i][j] = min(
+                dp[i - 1][j] + del_cost,
+                dp[i][j - 1] + ins_cost,
+                dp[i - 1][j - 1] + (0 if a[i - 1] == b[j - 1] else sub_cost),
+            )
+
+    # 由右下角往回走
+    path = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        if i > 0 and j > 0:
+            same = a[i - 1] == b[j - 1]
+            if dp[i][j] == dp[i - 1][j - 1] + (0 if same else sub_cost):
+                path.append(("match" if same else "replace", i0 + i - 1, j0 + j - 1))
+                i, j = i - 1, j - 1
+                continue
+        if i > 0 and dp[i][j] == dp[i - 1][j] + del_cost:
+            path.append(("delete", i0 + i - 1, None))
+            i -= 1
+        else:
+            path.append(("insert", None, j0 + j - 1))
+            j -= 1
+    ops.extend(reversed(path))
+
+
+def _hirschberg(a, b, i0, j0, ins_cost, del_cost, sub_cost, ops):
+    m, n = len(a), len(b)
+    if m == 0:
+        ops.extend(("insert", None, j0 + j) for j in range(n))
+        return
+    if n == 0:
+        ops.extend(("delete", i0 + i, None) for i in range(m))
+        return
+    if m <= 1 or n <= 1 or m * n <= BASE_CELLS:
+        _full_dp(a, b, i0, j0, ins_cost, del_cost, sub_cost, ops)
+        return
+
+    # 把 a 從中間切開：前半正向、後半反向各算一列，找出最佳的 b 切點
+    mid = m // 2
+    left = _last_row(a[:mid], b, ins_cost, del_cost, sub_cost)
+    right = _last_row(a[mid:][::-1], b[::-1], ins_cost, del_cost, sub_cost)
+    split = min(range(n + 1), key=lambda j: left[j] + right[n - j])
+
+    _hirschberg(a[:mid], b[:split], i0, j0, ins_cost, del_cost, sub_cost, ops)
+    _hirschberg(a[mid:], b[split:], i0 + mid, j0 + split, ins_cost, del_cost, sub_cost, ops)
+
+
+def edit_alignment(word1, word2, ins_cost=1, del_cost=1, sub_cost=1):
+    """
+    回傳 word1 -> word2 的最佳編輯腳本與對齊結果 (Hirschberg 分治法)。
+
+    與 min_edit_distance 相同的 DP，但只保留一列，
+    以「前半正向 + 後半反向」找出最佳路徑通過中間列的位置後遞迴，
+    記憶體為 O(m + n)，時間仍為 O(m * n)。
+    可以比較字串，也可以比較任意序列 (例如文件的行 list)。
+    三種操作的成本可分別指定。
+    """
+    ops = []
+    _hirschberg(word1, word2, 0, 0, ins_cost, del_cost, sub_cost, ops)
+
+    cost = {"match": 0, "replace": sub_cost, "insert": ins_cost, "delete": del_cost}
+    distance = sum(cost[op] for op, _, _ in ops)
+
+    aligned1, aligned2 = [], []
+    for op, i, j in ops:
+        aligned1.append(None if i is None else word1[i])
+        aligned2.append(None if j is None else word2[j])
+    if isinstance(word1, str) and isinstance(word2, str):
+        aligned1 = "".join("-" if x is None else x for x in aligned1)
+        aligned2 = "".join("-" if x is None else x for x in aligned2)
+
+    return Alignment(distance, ops, aligned1, aligned2)
+
+
+# --- 測試範例 ---
+if __name__ == "__main__":
+    result = edit_alignment("intention", "execution")
+    print(f"distance = {result.distance}")
+    print(result.aligned1)
+    print(result.aligned2)
+    for op in result.ops:
+        print(op)
@@ -0,0 +1,228 @@
+import heapq
+import pickle
+
+from miniEditDistance import min_edit_distance_bitparallel as edit_distance
+
+
+def _save(path, kind, state):
+    with open(path, "wb") as f:
+        pickle.dump((kind, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load(path, kind):
+    with open(path, "rb") as f:
+        got, state = pickle.load(f)
+    if got != kind:
+        raise ValueError(f"{path} 不是 {kind} 索引 (而是 {got})")
+    return state
+
+
+class BKTree:
+    """
+    以編輯距離為度量的 BK-tree。
+
+    每個節點的子節點依「與父節點的距離」分類；查詢距離 d 時由三角不等式可知，
+    只有邊上距離落在 [d - k, d + k] 的子樹可能含有答案，其餘整棵子樹都能跳過。
+    節點以扁平的 list 儲存 (words[i]、children[i] = {距離: 子節點編號})，方便快速存讀檔。
+    """
+
+    def __init__(self):
+        self.words = []
+        self.children = []
+
+    @classmethod
+    def build(cls, words):
+        tree = cls()
+        for word in words:
+            tree.add(word)
+        return tree
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word):
+        if not self.words:
+            self.words.append(word)
+            self.children.append({})
+            return
+
+        node = 0
+        while True:
+            d = edit_distance(word, self.words[node])
+            if d == 0:
+                return  # 重複的字
+            child = self.children[node].get(d)
+            if child is None:
+                self.children[node][d] = len(self.words)
+                self.words.append(word)
+                self.children.append({})
+                return
+            node = child
+
+    def query(self, word, k):
+        """所有距離 <= k 的字，回傳依距離排序的 [(距離, 字), ...]"""
+        if not self.words:
+            return []
+
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            d = edit_distance(word, self.words[node])
+            if d <= k:
+                found.append((d, self.words[node]))
+            for edge, child in self.children[node].items():
+                if d - k <= edge <= d + k:
+                    stack.append(child)
+        found.sort()
+        return found
+
+    def nearest(self, word, n=1):
+        """
+        最接近的 n 個字 (best-first)：子樹的下界為 |d - 邊距離|，
+        下界已超過目前第 n 名的距離時整棵子樹剪掉。
+        """
+        if not self.words or n <= 0:
+            return []
+
+        best = []  # 以負距離維持的 max-heap，保留目前最好的 n 個
+        frontier = [(0, 0)]
+        while frontier:
+            bound, node = heapq.heappop(frontier)
+            if len(best) == n and bound > -best[0][0]:
+                break
+
+            d = edit_distance(word, self.words[node])
+            if len(best) < n:
+                heapq.heappush(best, (-d, self.words[node]))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, self.words[node]))
+
+            limit = -best[0][0] if len(best) == n else float("inf")
+            for edge, child in self.children[node].items():
+                child_bound = abs(d - edge)
+                if child_bound <= limit:
+                    heapq.heappush(frontier, (child_bound, child))
+
+        return sorted((-d, w) for d, w in best)
+
+    def save(self, path):
+        _save(path, "bktree", (self.words, self.children))
+
+    @classmethod
+    def load(cls, path):
+        tree = cls()
+        tree.words, tree.children = _load(path, "bktree")
+        return tree
+
+
+class TrieIndex:
+    """
+    以 trie 搜尋模糊字典：沿著 trie 往下走時，一次只算一列 DP，
+    有共同前綴的字共用同一段 DP 列，而不是每個字各算一張表。
+    某列的最小值是所有後代字距離的下界，超過 k 即可剪掉整棵子樹。
+    """
+
+    def __init__(self):
+        self.children = [{}]   # children[node] = {字元: 子節點}
+        self.terminal = [None]  # 該節點結束的字 (沒有則為 None)
+
+    @classmethod
+    def build(cls, words):
+        trie = cls()
+        for word in words:
+            trie.add(word)
+        return trie
+
+    def __len__(self):
+        return sum(w is not None for w in self.terminal)
+
+    def add(self, word):
+        node = 0
+        for c in word:
+            nxt = self.children[node].get(c)
+            if nxt is None:
+                nxt = len(self.children)
+                self.children[node][c] = nxt
+                self.children.append({})
+                self.terminal.append(None)
+            node = nxt
+        self.terminal[node] = word
+
+    @staticmethod
+    def _next_row(prev, c, word):
+        """由上一列與新的 trie 字元 c 算出下一列 DP"""
+        row = [prev[0] + 1]
+        for j in range(1, len(word) + 1):
+            if word[j - 1] == c:
+                row.append(prev[j - 1])
+            else:
+                row.append(1 + min(prev[j], row[j - 1], prev[j - 1]))
+        return row
+
+    def query(self, word, k):
+        """所有距離 <= k 的字，回傳依距離排序的 [(距離, 字), ...]"""
+        found = []
+        first = list(range(len(word) + 1))
+        if self.terminal[0] is not None and first[-1] <= k:
+            found.append((first[-1], self.terminal[0]))
+
+        stack = [(child, c, first) for c, child in self.children[0].items()]
+        while stack:
+            node, c, prev = stack.pop()
+            row = self._next_row(prev, c, word)
+            if self.terminal[node] is not None and row[-1] <= k:
+                found.append((row[-1], self.terminal[node]))
+            if min(row) <= k:
+                for c2, child in self.children[node].items():
+                    stack.append((child, c2, row))
+        found.sort()
+        return found
+
+    def nearest(self, word, n=1):
+        """
+        最接近的 n 個字 (best-first)：節點以該列最小值為優先序，
+        字則以實際距離放進同一個 heap，因此字彈出的順序就是距離由小到大。
+        """
+        if n <= 0:
+            return []
+
+        found = []
+        tick = 0  # 同分時的順序，避免比較到 list
+        first = list(range(len(word) + 1))
+        heap = [(0, tick, 0, first, None)]
+        while heap and len(found) < n:
+            key, _, node, row, hit = heapq.heappop(heap)
+            if hit is not None:
+                found.append((key, hit))
+                continue
+
+            if self.terminal[node] is not None:
+                tick += 1
+                heapq.heappush(heap, (row[-1], tick, node, None, self.terminal[node]))
+            for c, child in self.children[node].items():
+                child_row = self._next_row(row, c, word)
+                tick += 1
+                heapq.heappush(heap, (min(child_row), tick, child, child_row, None))
+        return sorted(found)
+
+    def save(self, path):
+        _save(path, "trie", (self.children, self.terminal))
+
+    @classmethod
+    def load(cls, path):
+        trie = cls()
+        trie.children, trie.terminal = _load(path, "trie")
+        return trie
+
+
+# --- 測試範例 ---
+if __name__ == "__main__":
+    words = ["horse", "house", "ros", "rose", "hose", "horses", "mouse", "execution", "intention"]
+
+    bk = BKTree.build(words)
+    trie = TrieIndex.build(words)
+    print("BK-tree  query('horse', 1):", bk.query("horse", 1))
+    print("Trie     query('horse', 1):", trie.query("horse", 1))
+    print("BK-tree  nearest('rouse', 3):", bk.nearest("rouse", 3))
+    print("Trie     nearest('rouse', 3):", trie.nearest("rouse", 3))
@@ -36,6 +36,134 @@ def min_edit_distance(word1, word2):
     # 回傳表格右下角的值，即為最終答案
     return dp[m][n]
 
+
+def min_edit_distance_linear(word1, word2):
+    """
+    只保留兩列的最小編輯距離，記憶體為 O(min(m, n))。
+    dp[i][j] 只依賴上一列與本列左邊，所以不需要整張 (m+1) x (n+1) 表格。
+    """
+    # 讓 word2 是較短的字串，列的長度就是 min(m, n) + 1
+    if len(word1) < len(word2):
+        word1, word2 = word2, word1
+    n = len(word2)
+
+    prev = list(range(n + 1))
+    cur = [0] * (n + 1)
+    for i in range(1, len(word1) + 1):
+        cur[0] = i
+        c1 = word1[i - 1]
+        for j in range(1, n + 1):
+            if c1 == word2[j - 1]:
+                cur[j] = prev[j - 1]
+            else:
+                cur[j] = 1 + min(prev[j], cur[j - 1], prev[j - 1])
+        prev, cur = cur, prev
+
+    return prev[n]
+
+
+def min_edit_distance_banded(word1, word2, max_distance):
+    """
+    帶狀 (Ukkonen) 最小編輯距離：只回答「是否在 max_distance 步以內」。
+
+    距離 <= k 的最佳路徑不可能離開主對角線超過 k 格，
+    因此每一列只需計算 |i - j| <= k 的 2k+1 格，整體為 O(k * min(m, n))；
+    一旦某一列帶內的最小值已超過 k，就可提早結束。
+    回傳實際距離 (<= max_distance)，超過門檻時回傳 max_distance + 1。
+    """
+    k = max_distance
+    too_far = k + 1
+    if len(word1) < len(word2):
+        word1, word2 = word2, word1
+    m, n = len(word1), len(word2)
+    if m - n > k:
+        return too_far
+
+    # 帶外的格子一律視為 too_far
+    prev = [j if j <= k else too_far for j in range(n + 1)]
+    cur = [too_far] * (n + 1)
+    for i in range(1, m + 1):
+        lo = max(1, i - k)
+        hi = min(n, i + k)
+        cur[lo - 1] = i if lo == 1 else too_far
+
+        c1 = word1[i - 1]
+        row_min = cur[lo - 1]
+        for j in range(lo, hi + 1):
+            if c1 == word2[j - 1]:
+                v = prev[j - 1]
+            else:
+                v = 1 + min(prev[j], cur[j - 1], prev[j - 1])
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+
+        # 下一列會讀到 prev[hi + 1]，必須是帶外的值
+        if hi < n:
+            cur[hi + 1] = too_far
+        if row_min > k:
+            return too_far
+        prev, cur = cur, prev
+
+    return min(prev[n], too_far)
+
+
+def min_edit_distance_bitparallel(word1, word2):
+    """
+    位元平行 (Myers / Hyyrö) 的最小編輯距離，結果與 min_edit_distance 相同。
+
+    把較短的字串當作 pattern，每個字元預先建立一個位置 bitmask (Peq)；
+    DP 的一整欄以「垂直差值」的兩個 bit 向量 Pv (+1) / Mv (-1) 表示，
+    每讀入 text 的一個字元，只需幾個整數運算就能推進整欄。
+    Python 的 int 沒有長度上限，所以 pattern 多長都不需要分塊。
+    """
+    # 共同前綴 / 後綴不影響距離，先去掉
+    start = 0
+    while start < len(word1) and start < len(word2) and word1[start] == word2[start]:
+        start += 1
+    end1, end2 = len(word1), len(word2)
+    while end1 > start and end2 > start and word1[end1 - 1] == word2[end2 - 1]:
+        end1 -= 1
+        end2 -= 1
+    word1, word2 = word1[start:end1], word2[start:end2]
+
+    if len(word1) > len(word2):
+        word1, word2 = word2, word1
+    m = len(word1)
+    if m == 0:
+        return len(word2)
+
+    # Peq[c]：pattern 中字元 c 出現位置的 bitmask
+    peq = {}
+    for i, c in enumerate(word1):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv = mask, 0
+    score = m
+
+    for c in word2:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+
+        # 最後一列 (整個 pattern) 的水平差值決定分數變化
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+
+        # 第 0 列是 D[0][j] = j，所以水平差值從 +1 移入
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+
+    return score
+
 # --- 測試範例 ---
 if __name__ == "__main__":
     s1 = "horse"
@@ -45,4 +173,9 @@ if __name__ == "__main__":
     print(f"'{s1}' 轉換成 '{s2}' 的最小編輯距離為: {dist}")
     
     # 經典範例 2
-    print(f"'intention' -> 'execution': {min_edit_distance('intention', 'execution')}")
\ No newline at end of file
+    print(f"'intention' -> 'execution': {min_edit_distance('intention', 'execution')}")
+
+    # 兩列版本與帶狀版本 (只關心是否在 k 步以內)
+    print(f"linear: {min_edit_distance_linear(s1, s2)}")
+    print(f"banded (k=2): {min_edit_distance_banded(s1, s2, 2)}  (> 2 時回傳 3)")
+    print(f"bit-parallel: {min_edit_distance_bitparallel(s1, s2)}")
\ No newline at end of file
@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# 每個 tile 的大小 (tile x tile 個字串對一起做向量化 DP)
+TILE = 64
+
+
+def encode(strings):
+    """
+    把字串 list 轉成補齊的整數陣列 (Unicode code point)，回傳 (codes, lengths)。
+    codes 的形狀為 (字串數, 最長長度)，補齊的部分填 -1。
+    """
+    lengths = np.array([len(s) for s in strings], dtype=np.int64)
+    codes = np.full((len(strings), max(1, lengths.max(initial=0))), -1, dtype=np.int32)
+    for row, s in enumerate(strings):
+        if s:
+            codes[row, :len(s)] = np.frombuffer(s.encode("utf-32-le"), dtype=np.uint32)
+    return codes, lengths
+
+
+def batch_edit_distance(a_codes, a_len, b_codes, b_len):
+    """
+    同時計算 P 組字串對的編輯距離 (第 p 組為 a_codes[p] 對 b_codes[p])。
+
+    DP 逐列推進，每一列對所有字串對、所有欄位一次算完：
+    先由上一列算出「刪除 / 替換」的候選 t[j]，
+    再把「插入」造成的列內相依改寫成 cur[j] = j + min_{k<=j}(t[k] - k)，
+    用 np.minimum.accumulate 一次解決，整列不需要 Python 迴圈。
+    """
+    P, Lb = b_codes.shape
+    cols = np.arange(Lb + 1, dtype=np.int32)
+    prev = np.tile(cols, (P, 1))
+    result = np.where(a_len == 0, b_len, 0).astype(np.int32)
+    rows = np.arange(P)
+
+    cur = np.empty_like(prev)
+    for i in range(1, a_codes.shape[1] + 1):
+        mismatch = (a_codes[:, i - 1:i] != b_codes).view(np.int8)
+
+        # 刪除：prev[j] + 1；替換 / 相同：prev[j-1] + mismatch
+        cur[:, 0] = i
+        np.add(prev[:, 1:], 1, out=cur[:, 1:])
+        np.minimum(cur[:, 1:], prev[:, :-1] + mismatch, out=cur[:, 1:])
+
+        # 插入：列內的前綴最小值
+        cur -= cols
+        np.minimum.accumulate(cur, axis=1, out=cur)
+        cur += cols
+
+        prev, cur = cur, prev
+        done = a_len == i
+        if done.any():
+            result[done] = prev[rows[done], b_len[done]]
+    return result
+
+
+# ---------- process pool ----------
+# 每個 worker 只在初始化時收到一次編碼後的字串，之後每個工作只傳 tile 座標
+_shared = {}
+
+
+def _init_worker(a_codes, a_len, b_codes, b_len, out_path, symmetric):
+    _shared.update(a_codes=a_codes, a_len=a_len, b_codes=b_codes, b_len=b_len,
+                   out_path=out_path, symmetric=symmetric, out=None)
+    if out_path is not None:
+        _shared["out"] = np.lib.format.open_memmap(out_path, mode="r+")
+
+
+def _tile_job(tile):
+    """計算一個 (列範圍, 欄範圍) tile；有 memmap 時直接寫入並回傳 None"""
+    r0, r1, c0, c1 = tile
+    a_len = _shared["a_len"][r0:r1]
+    b_len = _shared["b_len"][c0:c1]
+    a_codes = _shared["a_codes"][r0:r1, :max(1, a_len.max(initial=0))]
+    b_codes = _shared["b_codes"][c0:c1, :max(1, b_len.max(initial=0))]
+
+    # 展開成 (列數 * 欄數) 組字串對
+    nr, nc = r1 - r0, c1 - c0
+    block = batch_edit_distance(
+        np.repeat(a_codes, nc, axis=0), np.repeat(a_len, nc),
+        np.tile(b_codes, (nr, 1)), np.tile(b_len, nr),
+    ).reshape(nr, nc)
+
+    out = _shared["out"]
+    if out is None:
+        return tile, block
+    out[r0:r1, c0:c1] = block
+    if _shared["symmetric"] and r0 != c0:
+        out[c0:c1, r0:r1] = block.T
+    return tile, None
+
+
+def pairwise_edit_distance(strings_a, strings_b=None, out_path=None, tile=TILE, workers=None):
+    """
+    兩組字串的全配對編輯距離矩陣 (int32)，形狀為 (len(strings_a), len(strings_b))。
+
+    strings_b 為 None 時計算 strings_a 自己的對稱矩陣，只算上三角的 tile 再鏡射。
+    矩陣切成 tile x tile 的區塊分給 process pool；workers=1 時在目前 process 執行。
+    給 out_path 時結果寫進 .npy 格式的 memory-mapped 檔 (np.load(path, mmap_mode="r") 可讀回)，
+    整個矩陣不需要放在記憶體中。
+    """
+    symmetric = strings_b is None
+    a_codes, a_len = encode(strings_a)
+    b_codes, b_len = (a_codes, a_len) if symmetric else encode(strings_b)
+    shape = (len(a_len), len(b_len))
+
+    if out_path is not None:
+        out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.int32, shape=shape)
+    else:
+        out = np.zeros(shape, dtype=np.int32)
+
+    tiles = []
+    for r0 in range(0, shape[0], tile):
+        for c0 in range(r0 if symmetric else 0, shape[1], tile):
+            tiles.append((r0, min(r0 + tile, shape[0]), c0, min(c0 + tile, shape[1])))
+
+    workers = workers or os.cpu_count() or 1
+    initargs = (a_codes, a_len, b_codes, b_len, out_path, symmetric)
+    if workers == 1:
+        _init_worker(*initargs)
+        results = map(_tile_job, tiles)
+    else:
+        if out_path is not None:
+            out.flush()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+        results = pool.map(_tile_job, tiles, chunksize=max(1, len(tiles) // (workers * 8)))
+
+    # 只有在記憶體內輸出時，worker 才會把區塊傳回來
+    for (r0, r1, c0, c1), block in results:
+        if block is not None:
+            out[r0:r1, c0:c1] = block
+            if symmetric and r0 != c0:
+                out[c0:c1, r0:r1] = block.T
+
+    if workers != 1:
+        pool.shutdown()
+    _shared.clear()
+    if out_path is not None:
+        out.flush()
+    return out
+
+
+# --- 測試範例 ---
+if __name__ == "__main__":
+    words = ["horse", "ros", "intention", "execution", ""]
+    print(pairwise_edit_distance(words, workers=1))
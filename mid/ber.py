@@ -0,0 +1,130 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from modulation import QAMModem
+from frame import OFDMFrame
+
+# 每個向量化批次包含幾個 OFDM 符號
+SWEEP_BATCH = 1024
+
+
+def ebn0_to_noise_level(ebn0_db, modem):
+    """
+    Eb/N0 (dB) -> 時域雜訊每個實部/虛部分量的標準差。
+
+    星座平均能量 Es = 2；OFDMFrame 的 FFT 為么正轉換 (norm="ortho")，
+    每個子載波的雜訊變異數就是時域的 2 * sigma^2，
+    因此 Eb/N0 = Es / (k * 2 * sigma^2)，與 FFT 大小無關。CP 的能量損失不計入。
+    """
+    ebn0 = 10 ** (ebn0_db / 10)
+    es = np.mean(np.abs(modem.constellation) ** 2)
+    return math.sqrt(es / (2 * modem.bits_per_symbol * ebn0))
+
+
+def wilson_interval(errors, trials, z=1.96):
+    """二項比例的 Wilson 信賴區間 (預設 95%)"""
+    if trials == 0:
+        return (0.0, 1.0)
+    p = errors / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return (max(0.0, center - half), min(1.0, center + half))
+
+
+def _simulate_point(modem, frame, ebn0_db, target_errors, max_bits, seed):
+    """
+    單一 Eb/N0 點的 Monte Carlo 模擬：整批產生隨機 bits -> 調變 -> OFDM -> AWGN -> 解調，
+    直到累積 target_errors 個 bit 錯誤或用完 max_bits 為止。
+    """
+    rng = np.random.default_rng(seed)
+    sigma = ebn0_to_noise_level(ebn0_db, modem)
+    k = modem.bits_per_symbol
+
+    # 符號索引 XOR 後的 popcount 即為該符號的 bit 錯誤數
+    popcount = np.array([bin(i).count("1") for i in range(modem.order)], dtype=np.int64)
+
+    batch_symbols = frame.n_data * SWEEP_BATCH
+    bits = bit_errors = symbols = symbol_errors = 0
+
+    while bit_errors < target_errors and bits < max_bits:
+        n_sym = min(batch_symbols, -(-(max_bits - bits) // k))
+
+        # 直接產生符號索引，等同於均勻隨機的 bit 串流
+        tx_idx = rng.integers(0, modem.order, n_sym)
+        tx_signal = frame.modulate(modem.constellation[tx_idx])
+
+        noise = rng.standard_normal(tx_signal.shape) + 1j * rng.standard_normal(tx_signal.shape)
+        rx_signal = tx_signal + sigma * noise
+
+        rx_symbols = frame.extract(frame.demodulate(rx_signal), n_sym)
+        rx_idx = modem.slice_indices(rx_symbols)
+
+        wrong = rx_idx != tx_idx
+        symbol_errors += int(np.count_nonzero(wrong))
+        bit_errors += int(popcount[rx_idx[wrong] ^ tx_idx[wrong]].sum())
+        symbols += n_sym
+        bits += n_sym * k
+
+    return bit_errors, bits, symbol_errors, symbols
+
+
+def _run_task(task):
+    """process pool 的工作單元 (需為模組層級函式才能 pickle)"""
+    modulation, gray, frame, ebn0_db, target_errors, max_bits, seed = task
+    return _simulate_point(QAMModem(modulation, gray), frame, ebn0_db,
+                           target_errors, max_bits, seed)
+
+
+def ber_sweep(ebn0_db_list, modulation="qpsk", gray=True, frame=None,
+              target_errors=200, max_bits=10_000_000, workers=None, seed=None):
+    """
+    BER / SER 對 Eb/N0 的 Monte Carlo 掃描。
+
+    每個 Eb/N0 點會切成數個獨立的試驗區塊 (各自擁有由 SeedSequence 派生的 RNG)，
+    分散到 process pool 上執行，最後合併成 BER / SER 與 95% Wilson 信賴區間。
+    workers=1 時不建立 process pool，直接在目前的 process 執行。
+
+    回傳 list，每個元素為一個 Eb/N0 點的結果 dict。
+    """
+    frame = frame if frame else OFDMFrame()
+    workers = workers or os.cpu_count() or 1
+    points = list(ebn0_db_list)
+
+    # 點數少於 worker 時，把每個點再切成多個區塊，讓所有核心都有工作
+    splits = max(1, -(-workers // max(1, len(points))))
+    seeds = np.random.SeedSequence(seed).spawn(len(points) * splits)
+
+    tasks = []
+    for i, ebn0_db in enumerate(points):
+        for s in range(splits):
+            tasks.append((modulation, gray, frame, ebn0_db,
+                          -(-target_errors // splits), -(-max_bits // splits),
+                          seeds[i * splits + s]))
+
+    if workers == 1:
+        outcomes = [_run_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_run_task, tasks))
+
+    results = []
+    for i, ebn0_db in enumerate(points):
+        bit_errors, bits, symbol_errors, symbols = (
+            sum(col) for col in zip(*outcomes[i * splits:(i + 1) * splits])
+        )
+        results.append({
+            "ebn0_db": ebn0_db,
+            "ber": bit_errors / bits if bits else 0.0,
+            "ber_ci": wilson_interval(bit_errors, bits),
+            "ser": symbol_errors / symbols if symbols else 0.0,
+            "ser_ci": wilson_interval(symbol_errors, symbols),
+            "bit_errors": bit_errors,
+            "bits": bits,
+            "symbol_errors": symbol_errors,
+            "symbols": symbols,
+        })
+    return results
@@ -0,0 +1,178 @@
+import numpy as np
+
+# 所有通道元件都作用在 (OFDM 符號數, N + CP) 的時域陣列上，
+# 呼叫方式一律為 stage(signal, frame, rng, out=None) -> 新的 signal；
+# 給 out 時結果寫進該緩衝區 (可與 signal 為同一個陣列)。
+
+
+def _store(result, out):
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def _convolve_rows(signal, taps):
+    """
+    以 FFT 域相乘對整條串列訊號做線性摺積。
+    taps 可以是 (T,) 的固定通道，或 (符號數, T) 的逐符號通道；
+    每個 OFDM 符號摺積後多出的尾巴會疊加到下一個符號的開頭 (由 CP 吸收)。
+    """
+    n_sym, L = signal.shape
+    T = taps.shape[-1]
+    if T - 1 > L:
+        raise ValueError("通道長度不可超過一個 OFDM 符號")
+
+    nfft = 1 << (L + T - 2).bit_length()
+    spectrum = np.fft.fft(signal, nfft, axis=1)
+    spectrum *= np.fft.fft(taps, nfft, axis=-1)
+    conv = np.fft.ifft(spectrum, axis=1)
+
+    out = conv[:, :L]
+    out[1:, :T - 1] += conv[:-1, L:L + T - 1]
+    return out
+
+
+class AWGN:
+    """
+    加性高斯白雜訊。給 snr_db 時依訊號實際平均功率換算；
+    給 noise_level 時直接當作實部/虛部的標準差 (與舊版 L1_ofdm 相同)。
+    """
+
+    def __init__(self, snr_db=None, noise_level=None):
+        if (snr_db is None) == (noise_level is None):
+            raise ValueError("snr_db 與 noise_level 需擇一指定")
+        self.snr_db = snr_db
+        self.noise_level = noise_level
+
+    def __call__(self, signal, frame, rng, out=None):
+        if self.noise_level is not None:
+            sigma = self.noise_level
+        else:
+            power = np.vdot(signal, signal).real / signal.size
+            sigma = np.sqrt(power / (2 * 10 ** (self.snr_db / 10)))
+
+        if out is None:
+            out = np.empty(signal.shape, dtype=np.complex128)
+
+        if out is signal:
+            noise = rng.standard_normal(signal.shape + (2,)).view(np.complex128)[..., 0]
+            noise *= sigma
+            out += noise
+            return out
+
+        # 把實部/虛部的高斯亂數直接產生在輸出緩衝區裡，再原地縮放、加上訊號
+        rng.standard_normal(out=out.view(np.float64))
+        out *= sigma
+        out += signal
+        return out
+
+
+class Multipath:
+    """固定的 tapped-delay-line 多路徑通道，taps[l] 為延遲 l 個樣本的複數增益"""
+
+    def __init__(self, taps):
+        self.taps = np.asarray(taps, dtype=np.complex128)
+
+    def __call__(self, signal, frame, rng, out=None):
+        return _store(_convolve_rows(signal, self.taps), out)
+
+
+class Fading:
+    """
+    Rayleigh / Rician 區塊衰落：每 block_symbols 個 OFDM 符號重新抽一組 tap 增益，
+    區塊內維持不變。pdp 為各 tap 的平均功率 (power delay profile，會正規化成總和 1)；
+    Rician 的直視路徑 (LOS) 只出現在第一個 tap，k_factor 為 LOS 與散射功率比。
+    """
+
+    def __init__(self, kind="rayleigh", pdp=(1.0,), k_factor=0.0, block_symbols=1):
+        if kind not in ("rayleigh", "rician"):
+            raise ValueError(f"未知的衰落類型: {kind}")
+        pdp = np.asarray(pdp, dtype=float)
+        self.kind = kind
+        self.pdp = pdp / pdp.sum()
+        self.k_factor = k_factor if kind == "rician" else 0.0
+        self.block_symbols = block_symbols
+        self.last_taps = None
+
+    def draw_taps(self, n_blocks, rng):
+        """產生 (區塊數, tap 數) 的通道增益"""
+        shape = (n_blocks, len(self.pdp))
+        scatter = (rng.standard_normal(shape) + 1j * rng.standard_normal(shape)) / np.sqrt(2)
+        K = self.k_factor
+        scatter *= np.sqrt(1 / (K + 1))
+        scatter[:, 0] += np.sqrt(K / (K + 1))
+        return scatter * np.sqrt(self.pdp)
+
+    def __call__(self, signal, frame, rng, out=None):
+        n_sym = len(signal)
+        n_blocks = -(-n_sym // self.block_symbols)
+        taps = np.repeat(self.draw_taps(n_blocks, rng), self.block_symbols, axis=0)[:n_sym]
+        self.last_taps = taps
+        return _store(_convolve_rows(signal, taps), out)
+
+
+class CFO:
+    """載波頻率偏移，epsilon 以子載波間距為單位 (0.1 = 十分之一個子載波)"""
+
+    def __init__(self, epsilon):
+        self.epsilon = epsilon
+
+    def __call__(self, signal, frame, rng, out=None):
+        n = np.arange(signal.size, dtype=float).reshape(signal.shape)
+        return np.multiply(signal, np.exp(2j * np.pi * self.epsilon * n / frame.n_subcarriers), out=out)
+
+
+class Channel:
+    """依序套用多個通道元件，整批 OFDM 符號一起處理"""
+
+    def __init__(self, stages, seed=None):
+        self.stages = list(stages)
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, signal, frame, out=None):
+        """第一個元件寫進 out，之後的元件都在 out 上原地處理"""
+        for stage in self.stages:
+            signal = stage(signal, frame, self.rng, out=out)
+        return signal
+
+
+# ---------- Rx：通道估測與等化 ----------
+def _signed(carriers, N):
+    """FFT 索引 -> 有號頻率 (-N/2 ~ N/2-1)，內插需在實際頻率軸上進行"""
+    return np.where(carriers < N // 2, carriers, carriers - N)
+
+
+def estimate_channel_ls(grid, frame):
+    """
+    以 pilot 做最小平方 (LS) 通道估測：H_p = Y_p / X_p，
+    再沿頻率軸線性內插到所有子載波 (超出 pilot 範圍的部分保持端點值)。
+    回傳 (符號數, N) 的頻率響應估計。
+    """
+    N = frame.n_subcarriers
+    h_pilot = grid[:, frame.pilot_carriers] / frame.pilot_value
+
+    pilot_f = _signed(frame.pilot_carriers, N)
+    order = np.argsort(pilot_f)
+    pilot_f = pilot_f[order]
+    h_pilot = h_pilot[:, order]
+
+    target_f = _signed(np.arange(N), N)
+    if len(pilot_f) == 1:
+        return np.repeat(h_pilot, N, axis=1)
+
+    # 每個子載波左右兩側的 pilot 與內插權重 (所有 OFDM 符號共用)
+    hi = np.clip(np.searchsorted(pilot_f, target_f), 1, len(pilot_f) - 1)
+    lo = hi - 1
+    w = (target_f - pilot_f[lo]) / (pilot_f[hi] - pilot_f[lo])
+    w = np.clip(w, 0.0, 1.0)
+
+    return h_pilot[:, lo] * (1 - w) + h_pilot[:, hi] * w
+
+
+def equalize(grid, frame, h=None):
+    """單 tap 等化 (zero forcing)：逐子載波除以估測的通道響應，直接修改 grid"""
+    if h is None:
+        h = estimate_channel_ls(grid, frame)
+    grid[:, frame.data_carriers] /= h[:, frame.data_carriers]
+    return h
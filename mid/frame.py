@@ -0,0 +1,155 @@
+import numpy as np
+
+# NumPy 2.0 起 np.fft 支援 out=，可直接寫進既有緩衝區；舊版則退回先算再複製
+try:
+    np.fft.fft(np.zeros(1, dtype=np.complex128), out=np.zeros(1, dtype=np.complex128))
+    _FFT_HAS_OUT = True
+except TypeError:
+    _FFT_HAS_OUT = False
+
+
+def fft_into(func, x, out):
+    """
+    沿 axis=1 做 func (np.fft.fft / ifft)，結果寫進 out。
+    使用 norm="ortho" (么正轉換)：時域雜訊的變異數原封不動地落在每個子載波上，
+    子載波 SNR 與 FFT 大小無關。
+    """
+    if _FFT_HAS_OUT:
+        return func(x, axis=1, norm="ortho", out=out)
+    out[...] = func(x, axis=1, norm="ortho")
+    return out
+
+
+def default_carriers(n_subcarriers):
+    """
+    依 802.11a 的配置比例產生預設的 pilot / null 子載波 (FFT 索引)。
+    N=64 時：DC 與 27~37 為 null，pilot 位於 ±7、±21。
+    """
+    N = n_subcarriers
+    guard = N * 5 // 64
+    nulls = [0] + list(range(N // 2 - guard, N // 2 + guard + 1))
+    pilots = [k % N for k in (-(N * 21 // 64), -(N * 7 // 64), N * 7 // 64, N * 21 // 64)]
+    return sorted(set(pilots) - set(nulls)), sorted(set(nulls))
+
+
+class OFDMFrame:
+    """
+    多符號 OFDM 訊框引擎。
+
+    把資料符號切成固定大小的 OFDM 符號，排成 (符號數, N) 的二維陣列，
+    IFFT / FFT 沿 axis=1 對所有 OFDM 符號一次算完，並加上 / 移除循環字首 (CP)。
+    FFT 大小固定為 N，因此每個 OFDM 符號的成本都是 O(N log N)，與訊息長度無關。
+    IFFT / FFT 都以 1/sqrt(N) 正規化 (見 fft_into)。
+
+    內部緩衝區只會在需要更多列時才重新配置，之後的呼叫都重複使用；
+    modulate / demodulate 回傳的是緩衝區的 view，下一次呼叫前請先用完或自行 copy。
+    也可以用 out= 傳入呼叫端自己管理的緩衝區 (例如 phy.PhyContext)。
+    """
+
+    def __init__(self, n_subcarriers=64, cp_len=16, pilot_carriers=None,
+                 null_carriers=None, pilot_value=1 + 1j):
+        N = n_subcarriers
+        default_pilots, default_nulls = default_carriers(N)
+        pilots = default_pilots if pilot_carriers is None else sorted(k % N for k in pilot_carriers)
+        nulls = default_nulls if null_carriers is None else sorted(k % N for k in null_carriers)
+
+        if set(pilots) & set(nulls):
+            raise ValueError("pilot 與 null 子載波不可重疊")
+        if not 0 <= cp_len <= N:
+            raise ValueError(f"CP 長度需介於 0 與 N 之間: {cp_len}")
+
+        self.n_subcarriers = N
+        self.cp_len = cp_len
+        self.pilot_value = pilot_value
+        self.pilot_carriers = np.array(pilots, dtype=np.intp)
+        self.null_carriers = np.array(nulls, dtype=np.intp)
+
+        used = set(pilots) | set(nulls)
+        self.data_carriers = np.array([k for k in range(N) if k not in used], dtype=np.intp)
+        if len(self.data_carriers) == 0:
+            raise ValueError("沒有可用的資料子載波")
+
+        self.n_data = len(self.data_carriers)
+        self.symbol_len = N + cp_len
+
+        # 重複使用的工作緩衝區 (依需要的列數成長)
+        self._tx_data = np.zeros((0, self.n_data), dtype=np.complex128)
+        self._tx_grid = np.zeros((0, N), dtype=np.complex128)
+        self._tx_time = np.zeros((0, self.symbol_len), dtype=np.complex128)
+        self._rx_grid = np.zeros((0, N), dtype=np.complex128)
+
+    def n_symbols(self, n_data_symbols):
+        """承載 n_data_symbols 個資料符號需要幾個 OFDM 符號"""
+        return -(-n_data_symbols // self.n_data)
+
+    @staticmethod
+    def _reserve(buf, rows):
+        """緩衝區少於 rows 列時才重新配置，否則原樣回傳"""
+        if len(buf) < rows:
+            buf = np.zeros((rows, buf.shape[1]), dtype=buf.dtype)
+        return buf
+
+    # ---------- Tx ----------
+    def modulate(self, data_symbols, out=None):
+        """
+        資料符號 (1-D) -> 含 CP 的時域 OFDM 符號，形狀 (符號數, N + CP)。
+        最後一個 OFDM 符號不足的資料子載波補 0。
+        """
+        data_symbols = np.asarray(data_symbols)
+        n_sym = self.n_symbols(len(data_symbols))
+
+        self._tx_data = self._reserve(self._tx_data, n_sym)
+        self._tx_grid = self._reserve(self._tx_grid, n_sym)
+        data = self._tx_data[:n_sym]
+        grid = self._tx_grid[:n_sym]
+        if out is None:
+            self._tx_time = self._reserve(self._tx_time, n_sym)
+            out = self._tx_time[:n_sym]
+
+        # 1. 排進頻域格子：資料 / pilot / null
+        flat = data.reshape(-1)
+        flat[:len(data_symbols)] = data_symbols
+        flat[len(data_symbols):] = 0
+        grid[:, self.data_carriers] = data
+        grid[:, self.pilot_carriers] = self.pilot_value
+        grid[:, self.null_carriers] = 0
+
+        # 2. 所有 OFDM 符號一起做 IFFT
+        cp = self.cp_len
+        fft_into(np.fft.ifft, grid, out[:, cp:])
+
+        # 3. 循環字首：把每個符號尾端 CP 個樣本複製到最前面
+        out[:, :cp] = out[:, self.n_subcarriers:]
+        return out
+
+    # ---------- Rx ----------
+    def demodulate(self, rx_signal, out=None):
+        """
+        時域 OFDM 符號 (符號數, N + CP) 或串列化的一維訊號 -> 頻域格子 (符號數, N)。
+        """
+        rx_signal = np.asarray(rx_signal).reshape(-1, self.symbol_len)
+        n_sym = len(rx_signal)
+
+        if out is None:
+            self._rx_grid = self._reserve(self._rx_grid, n_sym)
+            out = self._rx_grid[:n_sym]
+
+        # 移除 CP 後一次對所有符號做 FFT
+        return fft_into(np.fft.fft, rx_signal[:, self.cp_len:], out)
+
+    def extract(self, grid, n_data_symbols=None, out=None):
+        """從頻域格子取出資料子載波上的符號 (1-D)，可截斷到原本的資料長度"""
+        if out is not None:
+            n = len(out)
+            full, rem = divmod(n, self.n_data)
+            if full:
+                np.take(grid[:full], self.data_carriers, axis=1,
+                        out=out[:full * self.n_data].reshape(full, self.n_data))
+            if rem:
+                out[full * self.n_data:] = grid[full, self.data_carriers[:rem]]
+            return out
+
+        symbols = grid[:, self.data_carriers].reshape(-1)
+        if n_data_symbols is not None:
+            symbols = symbols[:n_data_symbols]
+        return symbols
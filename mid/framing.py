@@ -0,0 +1,82 @@
+import struct
+
+# 每層固定大小的二進位 Header：4 bytes 標籤 + 4 bytes 長度 (Header 之後的 bytes 數，網路位元組順序)
+HEADER = struct.Struct("!4sI")
+HEADER_SIZE = HEADER.size
+
+SESSION_TAG = b"SESS"
+TRANSPORT_TAG = b"TCP\x00"
+NETWORK_TAG = b"IP\x00\x00"
+DATALINK_TAG = b"MAC\x00"
+
+# 由內而外的封裝順序：L5 -> L4 -> L3 -> L2
+STACK_TAGS = (SESSION_TAG, TRANSPORT_TAG, NETWORK_TAG, DATALINK_TAG)
+
+
+def push_header(tag, data):
+    """
+    加上單一層的 Header (一次配置 + 一次複製)。
+    與 encapsulate 相同直接回傳 bytearray，不再轉成 bytes (那會多複製一次整個 payload)。
+    """
+    buf = bytearray(HEADER_SIZE + len(data))
+    HEADER.pack_into(buf, 0, tag, len(data))
+    buf[HEADER_SIZE:] = data
+    return buf
+
+
+def strip_header(tag, data):
+    """
+    移除單一層的 Header，回傳指向原始緩衝區的 memoryview (不複製 payload)。
+    標籤不符或長度不合理時視為損壞，原樣回傳。
+    """
+    view = memoryview(data)
+    if len(view) < HEADER_SIZE:
+        return view
+
+    got_tag, length = HEADER.unpack_from(view, 0)
+    if got_tag != tag or length > len(view) - HEADER_SIZE:
+        return view
+    return view[HEADER_SIZE:HEADER_SIZE + length]
+
+
+def encapsulate(data, tags=STACK_TAGS):
+    """
+    一次完成多層封裝：預先配置一個 bytearray，
+    把所有 Header 寫在前面、payload 只複製一次。
+    tags 依由內而外的順序給 (預設 L5, L4, L3, L2)。
+    """
+    n = len(tags)
+    buf = bytearray(HEADER_SIZE * n + len(data))
+
+    # 最外層 (最後一個 tag) 位於緩衝區最前面
+    for depth, tag in enumerate(reversed(tags)):
+        offset = HEADER_SIZE * depth
+        HEADER.pack_into(buf, offset, tag, len(buf) - offset - HEADER_SIZE)
+
+    buf[HEADER_SIZE * n:] = data
+    return buf
+
+
+def decapsulate(data, tags=STACK_TAGS):
+    """encapsulate 的反向操作：由外而內逐層以 memoryview 切片移除 Header"""
+    view = memoryview(data)
+    for tag in reversed(tags):
+        view = strip_header(tag, view)
+    return view
+
+
+def segment(chunks, packet_size):
+    """
+    把任意大小的 chunk 串流重新切成固定大小的封包 (最後一個可能較短)。
+    str 會先以 UTF-8 編碼；只保留不足一個封包的尾巴，記憶體用量與總長度無關。
+    """
+    pending = bytearray()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        pending += chunk
+        while len(pending) >= packet_size:
+            yield bytes(pending[:packet_size])
+            del pending[:packet_size]
+    if pending:
+        yield bytes(pending)
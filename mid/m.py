@@ -1,3 +1,5 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
@@ -5,7 +7,12 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # 引入剛剛修改過、具有真實運算能力的 ofdm 模組
-from ofdm import OSIStack, MAPPING_TABLE
+from ofdm import OSIStack
+
+# 星座圖最多畫幾個接收點，超過就等間隔抽樣 (避免百萬點 scatter 拖慢畫面)
+MAX_PLOT_POINTS = 4000
+# 背景 PHY 運算結果的輪詢間隔 (ms)，約 60 fps
+POLL_MS = 16
 
 class Demo:
     def __init__(self, root):
@@ -78,22 +85,55 @@ class Demo:
         self.canvas = FigureCanvasTkAgg(self.fig, fig_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
-        # 先畫一次空的背景格線
+        # PHY 在背景執行緒運算，結果經由 queue 交回 Tk 主執行緒
+        self.phy_results = queue.Queue()
+        self.busy = False
+
+        # 靜態內容 (子載波、理想星座點) 只畫一次，之後用 blitting 更新接收點
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
         self.init_plots()
 
     def init_plots(self):
-        # 左圖：OFDM Sinc 示意
-        self.ax_f.set_title("OFDM Orthogonal Subcarriers (Freq Domain)")
+        # 左圖：OFDM Sinc 示意 (靜態，只畫一次)
+        f = np.linspace(-6, 6, 1000)
+        colors = ['tab:blue', 'tab:orange', 'tab:green', 'tab:red', 'tab:purple']
+        for k in range(-2, 3):
+            # 畫出互相正交的 Sinc 波
+            y = np.sinc(f - k)
+            self.ax_f.plot(f, y, color=colors[(k+2)%5], linewidth=1.5)
+
+        self.ax_f.set_title("OFDM Orthogonal Subcarriers")
         self.ax_f.set_xlabel("Frequency")
-        self.ax_f.grid(True)
+        self.ax_f.grid(True, alpha=0.5)
         
         # 右圖：星座圖
-        self.ax_c.set_title("QPSK Constellation (Rx Symbols)")
+        # 畫出理想標準點 (紅色 X)
+        ideal_points = self.alice.modem.constellation
+        self.ax_c.scatter(np.real(ideal_points), np.imag(ideal_points), 
+                          color="red", marker="x", s=100, linewidth=2, label="Ideal")
+
+        # 接收點使用同一個持久的 artist，之後只更新座標 (animated -> 不進背景圖)
+        self.rx_scatter = self.ax_c.scatter([], [], alpha=0.6, label="Rx Symbols", animated=True)
+
+        lim = np.max(np.abs(ideal_points.real)) + 1
+        self.ax_c.set_title(f"{self.alice.modem.order}-QAM Constellation (Rx Symbols)")
         self.ax_c.set_xlabel("In-Phase (I)")
         self.ax_c.set_ylabel("Quadrature (Q)")
+        self.ax_c.set_xlim(-lim, lim)
+        self.ax_c.set_ylim(-lim, lim)
+        self.ax_c.axhline(0, color='black', linewidth=0.5)
+        self.ax_c.axvline(0, color='black', linewidth=0.5)
+        self.ax_c.set_aspect("equal")
         self.ax_c.grid(True)
+        self.ax_c.legend(loc="upper right", fontsize="small")
         self.canvas.draw()
 
+    def on_draw(self, event):
+        """整張圖重畫 (第一次顯示、視窗縮放) 後，重新擷取背景並補畫接收點"""
+        self.background = self.canvas.copy_from_bbox(self.ax_c.bbox)
+        self.ax_c.draw_artist(self.rx_scatter)
+
     # ================= Helpers =================
     def highlight(self, idx, color):
         """改變上方 OSI 標籤的顏色"""
@@ -105,10 +145,12 @@ class Demo:
         """將每一層的數據顯示在中間的文字框"""
         # 如果是 bytes，顯示其 hex 或長度；如果是 str 直接顯示
         display_text = str(data)
-        if isinstance(data, bytes):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            # L5~L2 拆封後是 memoryview，只轉出要顯示的部分
+            display_text = str(bytes(data[:60]))
             # 為了版面整潔，太長只顯示一部分
             if len(data) > 60:
-                display_text = f"{data[:60]}... (len={len(data)})"
+                display_text = f"{bytes(data[:60])}... (len={len(data)})"
         
         self.payload_box.insert("end", f"[{label}] -> {display_text}\n")
         self.payload_box.see("end")
@@ -116,12 +158,16 @@ class Demo:
     # ================= Flow Logic =================
     def start(self):
         """開始傳輸流程"""
+        # 上一次傳輸還在進行中就忽略
+        if self.busy: return
+
         self.payload_box.delete("1.0", "end")
         self.out_box.delete("1.0", "end")
         
         # 取得使用者輸入
         self.msg = self.in_box.get("1.0", "end").strip()
         if not self.msg: return
+        self.busy = True
 
         self.step = 0
         self.root.after(500, self.send_step)
@@ -162,31 +208,53 @@ class Demo:
         elif self.step == 6:
             self.highlight(6, "lightgreen") # L1
             
-            # === 關鍵修改：呼叫真實運算的 OFDM 模組 ===
+            # === 呼叫真實運算的 OFDM 模組 (背景執行緒，避免凍結視窗) ===
             # result 包含 {"constellation": 複數陣列, "data": 解調後的 bytes}
-            result = self.alice.L1_ofdm(self.data)
-            
-            # 1. 畫圖 (顯示接收到的含噪訊號)
-            self.draw(result["constellation"])
-            
-            # 2. 傳遞數據 (模擬從物理層解出來的 Bits 轉回 Bytes)
-            # 這一步確保 Bob 收到的是經過 IFFT/Channel/FFT 過程的資料
-            self.data = result["data"]
-            
-            self.show_payload("L1 (OFDM Tx->Rx)", "Signal Transmitted & Demodulated")
+            self.show_payload("L1 (OFDM Tx->Rx)", "Modulating in background ...")
+            threading.Thread(target=self.phy_worker, args=(self.data,), daemon=True).start()
+            self.root.after(POLL_MS, self.poll_phy)
+            return
 
         self.step += 1
-        if self.step <= 6:
-            self.root.after(600, self.send_step)
-        else:
-            # 傳送完畢，轉入接收階段
-            self.step = 6
-            self.root.after(600, self.recv_step)
+        self.root.after(600, self.send_step)
+
+    def phy_worker(self, data):
+        """背景執行緒：只做運算，不碰任何 Tk / matplotlib 物件"""
+        try:
+            self.phy_results.put(self.alice.L1_ofdm(data))
+        except Exception as e:
+            self.phy_results.put(e)
+
+    def poll_phy(self):
+        """Tk 主執行緒定期檢查背景運算是否完成"""
+        try:
+            result = self.phy_results.get_nowait()
+        except queue.Empty:
+            self.root.after(POLL_MS, self.poll_phy)
+            return
+
+        if isinstance(result, Exception):
+            self.payload_box.insert("end", f"\n[ERROR] PHY failed!\n{result}\n")
+            self.busy = False
+            return
+
+        # 1. 畫圖 (顯示接收到的含噪訊號)
+        self.draw(result["constellation"])
+        
+        # 2. 傳遞數據 (模擬從物理層解出來的 Bits 轉回 Bytes)
+        # 這一步確保 Bob 收到的是經過 IFFT/Channel/FFT 過程的資料
+        self.data = result["data"]
+        
+        self.show_payload("L1 (OFDM Tx->Rx)", "Signal Transmitted & Demodulated")
+
+        # 傳送完畢，轉入接收階段
+        self.step = 6
+        self.root.after(600, self.recv_step)
 
     def recv_step(self):
         """Bob 的接收過程 (L1 -> L7)"""
         
-        # 注意：如果雜訊太大導致資料損毀，split() 可能會報錯
+        # 注意：如果雜訊太大導致資料損毀，拆封或解碼可能會報錯
         # 這裡加個簡單的 try-except 來處理傳輸失敗的情況
         try:
             if self.step == 6:
@@ -223,6 +291,7 @@ class Demo:
                 final_msg = self.data.decode("utf-8", errors="ignore")
                 self.out_box.insert("end", final_msg)
                 self.show_payload("L7 (Received)", final_msg)
+                self.busy = False
                 return
 
             self.step -= 1
@@ -231,43 +300,23 @@ class Demo:
         except Exception as e:
             self.payload_box.insert("end", f"\n[ERROR] Data Corrupted during transmission!\n{e}\n")
             print(f"Error at step {self.step}: {e}")
+            self.busy = False
 
     # ================= Drawing Logic =================
     def draw(self, constellation):
-        # 1. 繪製左圖 (Sinc 波形示意)
-        self.ax_f.clear()
-        f = np.linspace(-6, 6, 1000)
-        colors = ['tab:blue', 'tab:orange', 'tab:green', 'tab:red', 'tab:purple']
-        for k in range(-2, 3):
-            # 畫出互相正交的 Sinc 波
-            y = np.sinc(f - k)
-            self.ax_f.plot(f, y, color=colors[(k+2)%5], linewidth=1.5)
-        
-        self.ax_f.set_title("OFDM Orthogonal Subcarriers")
-        self.ax_f.grid(True, alpha=0.5)
-
-        # 2. 繪製右圖 (星座圖)
-        self.ax_c.clear()
-        
-        # 畫出實際接收點 (藍色圓點，半透明)
-        self.ax_c.scatter(np.real(constellation), np.imag(constellation), 
-                          alpha=0.6, label="Rx Symbols")
-        
-        # 畫出理想標準點 (紅色 X)
-        ideal_points = list(MAPPING_TABLE.values())
-        self.ax_c.scatter(np.real(ideal_points), np.imag(ideal_points), 
-                          color="red", marker="x", s=100, linewidth=2, label="Ideal QPSK")
-        
-        self.ax_c.set_title("QPSK Constellation")
-        self.ax_c.set_xlim(-2, 2)
-        self.ax_c.set_ylim(-2, 2)
-        self.ax_c.axhline(0, color='black', linewidth=0.5)
-        self.ax_c.axvline(0, color='black', linewidth=0.5)
-        self.ax_c.set_aspect("equal")
-        self.ax_c.grid(True)
-        self.ax_c.legend(loc="upper right", fontsize="small")
-
-        self.canvas.draw()
+        """只更新接收點：抽樣後 set_offsets，再用 blitting 重畫右圖這一塊"""
+        if len(constellation) > MAX_PLOT_POINTS:
+            stride = -(-len(constellation) // MAX_PLOT_POINTS)
+            constellation = constellation[::stride]
+
+        self.rx_scatter.set_offsets(np.column_stack([constellation.real, constellation.imag]))
+
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.ax_c.draw_artist(self.rx_scatter)
+        self.canvas.blit(self.ax_c.bbox)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+import numpy as np
+
+# 可選的調變模式：名稱 -> 星座點數 M
+MODULATIONS = {
+    "qpsk": 4,
+    "16qam": 16,
+    "64qam": 64,
+}
+
+
+def gray_encode(k):
+    """自然二進位 -> Gray code (可直接作用在整數陣列上)"""
+    return k ^ (k >> 1)
+
+
+def gray_decode(g):
+    """Gray code -> 自然二進位 (可直接作用在整數陣列上)"""
+    k = g.copy() if isinstance(g, np.ndarray) else g
+    shift = g >> 1
+    while np.any(shift):
+        k = k ^ shift
+        shift = shift >> 1
+    return k
+
+
+def pam_levels(m, gray=True):
+    """
+    單一軸 (I 或 Q) 上 2^m 個 PAM 準位，依索引排列。
+    索引 0 對應最大的正準位 +(L-1)，與舊版 MAPPING_TABLE 中 bit 0 -> +1 的慣例一致。
+    """
+    L = 1 << m
+    idx = np.arange(L)
+    k = gray_decode(idx) if gray else idx
+    return (L - 1) - 2 * k
+
+
+def qam_constellation(order, gray=True):
+    """
+    建立方形 QAM 星座表：constellation[symbol_index] = 複數符號。
+
+    symbol_index 的高位半部給 Q 軸、低位半部給 I 軸，
+    並把平均能量正規化成 2 (也就是 QPSK 的 ±1±1j)，
+    讓 QPSK + Gray 與舊版 MAPPING_TABLE 完全相同。
+    """
+    k = int(order).bit_length() - 1
+    if order < 4 or (1 << k) != order or k % 2 != 0:
+        raise ValueError(f"不支援的 QAM 階數: {order} (需為 4, 16, 64 ...)")
+
+    m = k // 2
+    levels = pam_levels(m, gray)
+    idx = np.arange(order)
+    i_part = levels[idx & ((1 << m) - 1)]
+    q_part = levels[idx >> m]
+
+    # 方形 M-QAM 的平均能量為 2(M-1)/3，縮放到與 QPSK 相同的 2
+    scale = np.sqrt(2 / (2 * (order - 1) / 3))
+    return (i_part + 1j * q_part) * scale
+
+
+class QAMModem:
+    """
+    以查表 + 陣列運算完成的 QAM 調變 / 解調器。
+
+    Tx：把每 k 個 bits 打包成整數索引，再一次性地用 constellation[indices] 取出符號。
+    Rx：I、Q 兩軸分別做最近準位判決 (slicing)，不需要對每個符號計算所有距離。
+    """
+
+    def __init__(self, modulation="qpsk", gray=True):
+        if isinstance(modulation, str):
+            if modulation.lower() not in MODULATIONS:
+                raise ValueError(f"未知的調變模式: {modulation}")
+            order = MODULATIONS[modulation.lower()]
+        else:
+            order = int(modulation)
+
+        self.order = order
+        self.gray = gray
+        self.bits_per_symbol = order.bit_length() - 1
+        self.constellation = qam_constellation(order, gray)
+
+        m = self.bits_per_symbol // 2
+        self._m = m
+        self._levels_per_axis = 1 << m
+        self._scale = np.sqrt(2 / (2 * (order - 1) / 3))
+
+        # Rx 判決後的「自然二進位準位序號」-> 該軸的 bit 索引
+        k = np.arange(self._levels_per_axis)
+        self._axis_index = gray_encode(k) if gray else k
+
+        # 每個 bit 在 symbol_index 中的位移量 (MSB 在前)
+        self._shifts = np.arange(self.bits_per_symbol - 1, -1, -1, dtype=np.uint8)
+
+    # ---------- bits <-> 符號索引 ----------
+    # 以下方法都接受 out=，可把結果寫進呼叫端預先配置的緩衝區 (例如 phy.PhyContext)
+    def n_symbols(self, n_bits):
+        """n_bits 個 bits 需要幾個符號"""
+        return -(-n_bits // self.bits_per_symbol)
+
+    def bits_to_indices(self, bits, out=None):
+        """把 bit 陣列 (不足時補 0) 每 k 個一組打包成整數索引"""
+        bits = np.asarray(bits, dtype=np.uint8)
+        k = self.bits_per_symbol
+        n_full = len(bits) // k
+        if out is None:
+            out = np.empty(self.n_symbols(len(bits)), dtype=np.intp)
+
+        groups = bits[:n_full * k].reshape(-1, k)
+        indices = out[:n_full]
+        indices[:] = 0
+        for col in range(k):
+            indices <<= 1
+            indices |= groups[:, col]
+
+        # 尾端不足 k 個 bits：補 0 後組成最後一個索引
+        tail = bits[n_full * k:]
+        if len(tail):
+            out[n_full] = int((tail.astype(np.intp) << self._shifts[:len(tail)]).sum())
+        return out
+
+    def indices_to_bits(self, indices, n_bits=None, out=None):
+        """把整數索引展開回 bit 陣列，可選擇截斷到 n_bits"""
+        bits = ((indices[:, None] >> self._shifts) & 1).astype(np.uint8).ravel()
+        if n_bits is not None:
+            bits = bits[:n_bits]
+        if out is not None:
+            out[:] = bits
+            return out
+        return bits
+
+    # ---------- 調變 / 解調 ----------
+    def modulate(self, bits, out=None):
+        """Bits -> 複數符號 (整個陣列一次完成)"""
+        return np.take(self.constellation, self.bits_to_indices(bits), out=out)
+
+    def slice_indices(self, symbols, out=None):
+        """最近星座點判決：I/Q 兩軸各自量化到最近的準位，回傳符號索引"""
+        L = self._levels_per_axis
+        symbols = np.asarray(symbols)
+
+        # 準位 = (L-1) - 2k  ->  k = ((L-1) - 準位) / 2
+        k_i = np.rint(((L - 1) - symbols.real / self._scale) / 2)
+        k_q = np.rint(((L - 1) - symbols.imag / self._scale) / 2)
+        k_i = np.clip(k_i, 0, L - 1, out=k_i).astype(np.intp)
+        k_q = np.clip(k_q, 0, L - 1, out=k_q).astype(np.intp)
+
+        q_bits = np.left_shift(self._axis_index[k_q], self._m, out=k_q)
+        return np.bitwise_or(q_bits, self._axis_index[k_i], out=out)
+
+    def demodulate(self, symbols, n_bits=None, out=None):
+        """複數符號 -> Bits"""
+        return self.indices_to_bits(self.slice_indices(symbols), n_bits, out)
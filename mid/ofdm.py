@@ -1,6 +1,12 @@
-import numpy as np
 from cryptography.fernet import Fernet
 
+from modulation import QAMModem
+from frame import OFDMFrame
+from channel import Channel, AWGN
+from phy import PhyContext
+import framing
+from records import RecordCipher
+
 # QPSK mapping
 MAPPING_TABLE = {
     (0, 0): 1 + 1j,
@@ -9,10 +15,27 @@ MAPPING_TABLE = {
     (1, 0): 1 - 1j
 }
 
+# 串流傳輸時每個封包的 L7 payload 大小 (bytes)
+PACKET_SIZE = 64 * 1024
+
 class OSIStack:
-    def __init__(self, key=None):
+    def __init__(self, key=None, modulation="qpsk", gray=True, frame=None,
+                 channel=None, equalize=False, cipher_mode="fernet"):
         self.key = key if key else Fernet.generate_key()
         self.cipher = Fernet(self.key)
+        # "fernet"：整包 Fernet (base64 輸出)；"records"：分塊 AES-GCM、多執行緒、原始二進位輸出
+        if cipher_mode not in ("fernet", "records"):
+            raise ValueError(f"未知的 L6 模式: {cipher_mode}")
+        self.cipher_mode = cipher_mode
+        self.records = RecordCipher(self.key) if cipher_mode == "records" else None
+        self.modem = QAMModem(modulation, gray)
+        self.frame = frame if frame else OFDMFrame()
+        # 預設通道：noise_level = 0.01 的 AWGN；FFT 為么正轉換，
+        # 每個子載波的 SNR = Es / (2 * 0.01^2) = 40 dB，所有可選的調變都能正確還原
+        self.channel = channel if channel else Channel([AWGN(noise_level=0.01)])
+        # 常駐的 PHY 執行環境：重複使用 FFT 大小與工作緩衝區；
+        # 通道有衰落 / 多路徑時以 equalize 開啟 pilot LS 估測 + 單 tap 等化
+        self.phy = PhyContext(self.modem, self.frame, self.channel, equalize)
 
     # ---------- L7 Application ----------
     def L7(self, msg: str):
@@ -20,93 +43,92 @@ class OSIStack:
 
     # ---------- L6 Presentation ----------
     def L6_encrypt(self, data: bytes):
-        return self.cipher.encrypt(data)
+        if self.records:
+            return self.records.encrypt(data)
+        return self.cipher.encrypt(bytes(data))
 
     def L6_decrypt(self, data: bytes):
         
         try:
-            return self.cipher.decrypt(data)
+            if self.records:
+                return self.records.decrypt(data)
+            return self.cipher.decrypt(bytes(data))
         except:
             return b"[Decryption Failed] " + data
 
     # ---------- L5 Session ----------
+    # L5~L2 使用固定大小的 struct Header (標籤 + 長度)，
+    # *_remove 以 memoryview 切片移除 Header，不複製 payload；標籤不符則回傳原始(損壞)資料
     def L5(self, data: bytes):
-        return b"SESSION|" + data
+        return framing.push_header(framing.SESSION_TAG, data)
 
     def L5_remove(self, data: bytes):
-        # 安全移除 Header，找不到則回傳原始(損壞)資料
-        parts = data.split(b"|", 1)
-        return parts[1] if len(parts) > 1 else data
+        return framing.strip_header(framing.SESSION_TAG, data)
 
     # ---------- L4 Transport ----------
     def L4(self, data: bytes):
-        return b"TCP|" + data
+        return framing.push_header(framing.TRANSPORT_TAG, data)
 
     def L4_remove(self, data: bytes):
-        parts = data.split(b"|", 1)
-        return parts[1] if len(parts) > 1 else data
+        return framing.strip_header(framing.TRANSPORT_TAG, data)
 
     # ---------- L3 Network ----------
     def L3(self, data: bytes):
-        return b"IP|" + data
+        return framing.push_header(framing.NETWORK_TAG, data)
 
     def L3_remove(self, data: bytes):
-        parts = data.split(b"|", 1)
-        return parts[1] if len(parts) > 1 else data
+        return framing.strip_header(framing.NETWORK_TAG, data)
 
     # ---------- L2 Data Link ----------
     def L2(self, data: bytes):
-        return b"MAC|" + data
+        return framing.push_header(framing.DATALINK_TAG, data)
 
     def L2_remove(self, data: bytes):
-        parts = data.split(b"|", 1)
-        return parts[1] if len(parts) > 1 else data
-
-    # ---------- L1 Physical Layer (OFDM) ----------
-    def L1_ofdm(self, data: bytes):
-        # 1. Bytes -> Bits
-        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
-        original_bit_len = len(bits)
-
-        if len(bits) % 2 != 0:
-            bits = np.append(bits, 0)
-
-        # 2. Mapping
-        tx_symbols = []
-        for i in range(0, len(bits), 2):
-            b0, b1 = bits[i], bits[i+1]
-            tx_symbols.append(MAPPING_TABLE[(b0, b1)])
-        tx_symbols = np.array(tx_symbols)
+        return framing.strip_header(framing.DATALINK_TAG, data)
 
-        # 3. IFFT
-        tx_signal = np.fft.ifft(tx_symbols)
+    # ---------- L5~L2 一次完成 ----------
+    def encapsulate(self, data: bytes):
+        """L5 -> L2 的所有 Header 一次寫進同一個預先配置的 bytearray"""
+        return framing.encapsulate(data)
 
-        # 4. Channel (Add Noise)
-        noise_level = 0.01 
-        noise = np.random.normal(0, noise_level, tx_signal.shape) + \
-                1j * np.random.normal(0, noise_level, tx_signal.shape)
-        rx_signal = tx_signal + noise
+    def decapsulate(self, data: bytes):
+        """L2 -> L5 逐層以 memoryview 切片移除 Header (零複製)"""
+        return framing.decapsulate(data)
 
-        # 5. FFT
-        rx_symbols = np.fft.fft(rx_signal)
-
-        # 6. Demapping
-        rx_bits = []
-        possible_symbols = list(MAPPING_TABLE.values())
-        possible_bits = list(MAPPING_TABLE.keys())
-
-        for sym in rx_symbols:
-            distances = [abs(sym - ref) for ref in possible_symbols]
-            min_idx = np.argmin(distances)
-            b_tuple = possible_bits[min_idx]
-            rx_bits.extend(b_tuple)
-
-        rx_bits = np.array(rx_bits, dtype=np.uint8)
-        rx_bits = rx_bits[:original_bit_len]
+    # ---------- L1 Physical Layer (OFDM) ----------
+    def L1_ofdm(self, data: bytes, noise_level=None, out=None):
+        # noise_level：若指定則改用該標準差的 AWGN 取代 self.channel，
+        # 可用 ber.ebn0_to_noise_level(ebn0_db, self.modem) 由 Eb/N0 換算
+        # out：可選的 complex128 陣列，接收星座點直接寫入其中 (避免每次配置)
+        channel = None if noise_level is None else Channel([AWGN(noise_level=noise_level)])
 
-        rx_bytes = np.packbits(rx_bits).tobytes()
+        # Bytes -> Bits -> 符號 -> IFFT + CP -> Channel -> FFT -> 符號 -> Bits -> Bytes
+        # 各步驟都在 self.phy 依批次大小保留的緩衝區內完成
+        rx_bytes, rx_symbols = self.phy.run(data, channel, out)
 
         return {
             "constellation": rx_symbols,
             "data": rx_bytes
         }
+
+    # ---------- Streaming ----------
+    def transmit_stream(self, chunks, packet_size=PACKET_SIZE):
+        """
+        Alice 端的串流傳輸：把 chunks 重新切成封包，逐一經過 L6 -> L1 (含通道)，
+        產生每個封包在接收端 PHY 解調後的 bytes。採用 generator，任何時刻只處理一個封包。
+        """
+        for packet in framing.segment(chunks, packet_size):
+            frame = self.encapsulate(self.L6_encrypt(packet))
+            yield self.L1_ofdm(frame)["data"]
+
+    def receive_stream(self, frames):
+        """Bob 端的串流接收：逐一移除 L2~L5 Header 並解密，產生還原後的 payload"""
+        for frame in frames:
+            yield self.L6_decrypt(self.decapsulate(frame))
+
+
+if __name__ == "__main__":
+    # 無介面的效能量測：python -m ofdm bench --sizes 64k 1M --modulations qpsk 16qam
+    import sys
+    from bench import main
+    sys.exit(main())
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from channel import equalize as equalize_grid
+
+# 每批最多處理幾個 OFDM 符號 (限制長訊息時的暫存記憶體)
+OFDM_BATCH = 1024
+
+# 最多保留幾組不同大小的工作緩衝區 (LRU)
+POOL_SIZE = 8
+
+
+class Workspace:
+    """某一個批次大小 (資料符號數) 專用的整組工作緩衝區"""
+
+    def __init__(self, n_data_symbols, modem, frame):
+        n_sym = frame.n_symbols(n_data_symbols)
+        self.n_data_symbols = n_data_symbols
+        self.indices = np.empty(n_data_symbols, dtype=np.intp)
+        self.tx_symbols = np.empty(n_data_symbols, dtype=np.complex128)
+        self.tx_signal = np.empty((n_sym, frame.symbol_len), dtype=np.complex128)
+        self.rx_signal = np.empty((n_sym, frame.symbol_len), dtype=np.complex128)
+        self.rx_grid = np.empty((n_sym, frame.n_subcarriers), dtype=np.complex128)
+        self.rx_indices = np.empty(n_data_symbols, dtype=np.intp)
+
+
+class PhyContext:
+    """
+    常駐在 OSIStack 上的 PHY 執行環境。
+
+    - FFT 大小固定為 frame.n_subcarriers，NumPy (pocketfft) 會重複使用同一份 FFT plan
+    - 依批次大小保留整組工作緩衝區 (LRU，最多 POOL_SIZE 組)，
+      同樣大小的小封包重複呼叫時不再配置 bits / 符號 / IFFT / 雜訊 / FFT 暫存
+    - 雜訊由 channel 直接產生在 rx_signal 緩衝區內
+    - run(..., out=) 可把接收星座點寫進呼叫端的陣列
+    """
+
+    def __init__(self, modem, frame, channel, equalize=False):
+        self.modem = modem
+        self.frame = frame
+        self.channel = channel
+        self.equalize = equalize
+        self._pool = OrderedDict()
+
+    def workspace(self, n_data_symbols):
+        """取得 (或建立) 對應此批次大小的工作緩衝區"""
+        ws = self._pool.get(n_data_symbols)
+        if ws is None:
+            ws = Workspace(n_data_symbols, self.modem, self.frame)
+            self._pool[n_data_symbols] = ws
+            if len(self._pool) > POOL_SIZE:
+                self._pool.popitem(last=False)
+        else:
+            self._pool.move_to_end(n_data_symbols)
+        return ws
+
+    def process_symbols(self, tx_symbols, out, channel=None):
+        """
+        一個批次的 IFFT + CP -> Channel -> 去 CP + FFT (+ 等化)，
+        接收到的資料符號寫進 out (長度與 tx_symbols 相同)。
+        """
+        channel = channel if channel else self.channel
+        ws = self.workspace(len(tx_symbols))
+
+        tx_signal = self.frame.modulate(tx_symbols, out=ws.tx_signal)
+        rx_signal = channel(tx_signal, self.frame, out=ws.rx_signal)
+        rx_grid = self.frame.demodulate(rx_signal, out=ws.rx_grid)
+        if self.equalize:
+            equalize_grid(rx_grid, self.frame)
+        return self.frame.extract(rx_grid, out=out)
+
+    def run(self, data, channel=None, out=None):
+        """
+        bytes -> 經過 OFDM 與通道後解調出的 bytes。
+        out：可選，長度為符號數的 complex128 陣列，用來接收星座點；
+        回傳 (rx_bytes, 接收星座點)。
+        """
+        modem = self.modem
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        n_symbols = modem.n_symbols(len(bits))
+        if out is None:
+            out = np.empty(n_symbols, dtype=np.complex128)
+
+        batch = self.frame.n_data * OFDM_BATCH
+        rx_bits = np.empty(len(bits), dtype=np.uint8)
+
+        for start in range(0, n_symbols, batch):
+            stop = min(start + batch, n_symbols)
+            ws = self.workspace(stop - start)
+            chunk_bits = bits[start * modem.bits_per_symbol:stop * modem.bits_per_symbol]
+
+            # Mapping：bits -> 索引 -> 符號，全部寫在工作緩衝區內
+            modem.bits_to_indices(chunk_bits, out=ws.indices)
+            np.take(modem.constellation, ws.indices, out=ws.tx_symbols)
+
+            rx_symbols = self.process_symbols(ws.tx_symbols, out[start:stop], channel)
+
+            # Demapping
+            modem.slice_indices(rx_symbols, out=ws.rx_indices)
+            b0 = start * modem.bits_per_symbol
+            modem.indices_to_bits(ws.rx_indices, len(chunk_bits), out=rx_bits[b0:b0 + len(chunk_bits)])
+
+        return np.packbits(rx_bits).tobytes(), out
@@ -0,0 +1,87 @@
+import base64
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# 每個 record 的明文大小 (bytes)
+RECORD_SIZE = 64 * 1024
+
+# 串流開頭：4 bytes 標籤 + record 大小
+STREAM_HEADER = struct.Struct("!4sI")
+STREAM_TAG = b"L6R\x01"
+
+# 每個 record 的附加驗證資料：序號 + 是否為最後一個 (防止重排與截斷)
+RECORD_AAD = struct.Struct("!QB")
+
+NONCE_SIZE = 12
+TAG_SIZE = 16
+
+
+def derive_record_key(fernet_key):
+    """由共享的 Fernet key 以 HKDF 派生出 record 模式專用的 AES-256 key"""
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                info=b"OSIStack L6 record cipher")
+    return hkdf.derive(base64.urlsafe_b64decode(fernet_key))
+
+
+class RecordCipher:
+    """
+    分塊 (record) 加密：明文切成固定大小的 record，
+    每個 record 以 AES-GCM 獨立加密 + 驗證，並交給 thread pool 平行處理。
+
+    輸出為原始二進位 (不做 base64)，每個 record 只多 12 bytes nonce + 16 bytes tag：
+        [標籤 | record 大小] [nonce | 密文 | tag] [nonce | 密文 | tag] ...
+    """
+
+    def __init__(self, key, record_size=RECORD_SIZE, workers=None):
+        self.aead = AESGCM(derive_record_key(key))
+        self.record_size = record_size
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+
+    def _map(self, func, items):
+        """只有一個 record 時直接執行，否則交給 (延遲建立的) thread pool"""
+        if len(items) <= 1 or self.workers == 1:
+            return [func(item) for item in items]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return list(self._pool.map(func, items))
+
+    def _seal(self, item):
+        index, last, chunk = item
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + self.aead.encrypt(nonce, chunk, RECORD_AAD.pack(index, last))
+
+    def _open(self, item):
+        index, last, record = item
+        nonce = bytes(record[:NONCE_SIZE])
+        return self.aead.decrypt(nonce, record[NONCE_SIZE:], RECORD_AAD.pack(index, last))
+
+    def encrypt(self, data):
+        view = memoryview(data)
+        size = self.record_size
+        n = max(1, -(-len(view) // size))
+        items = [(i, i == n - 1, view[i * size:(i + 1) * size]) for i in range(n)]
+
+        sealed = self._map(self._seal, items)
+        return b"".join([STREAM_HEADER.pack(STREAM_TAG, size)] + sealed)
+
+    def decrypt(self, data):
+        """任何 record 驗證失敗 (竄改、重排、截斷) 都會拋出例外"""
+        view = memoryview(data)
+        if len(view) < STREAM_HEADER.size:
+            raise ValueError("record 串流過短")
+        tag, size = STREAM_HEADER.unpack_from(view, 0)
+        if tag != STREAM_TAG:
+            raise ValueError("不是 record 模式的密文")
+
+        body = view[STREAM_HEADER.size:]
+        stride = NONCE_SIZE + size + TAG_SIZE
+        n = max(1, -(-len(body) // stride))
+        items = [(i, i == n - 1, body[i * stride:(i + 1) * stride]) for i in range(n)]
+
+        return b"".join(self._map(self._open, items))